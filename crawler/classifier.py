@@ -13,9 +13,12 @@ Uses lightweight models that work on CPU without GPU requirements.
 
 import re
 from collections import Counter
+from pathlib import Path
 from typing import Optional
 from dataclasses import dataclass, field
 
+from .storage import content_line_span, iter_content_records
+
 # Try to import ML libraries, fall back to rule-based if not available
 try:
     from transformers import pipeline
@@ -409,3 +412,33 @@ def classify_content(text: str, url: str = "", title: str = "") -> dict:
         "word_count": result.word_count,
         "reading_time_minutes": result.reading_time_minutes
     }
+
+
+def classify_content_file(content_file: Path, limit: int) -> list[dict]:
+    """
+    Classify up to `limit` records from a crawl's content file.
+    
+    Kept out of the web API so worker processes running it import only this module.
+    """
+    results = []
+    classifier = get_classifier(use_ml=False)  # Use fast rule-based
+    
+    with open(content_file, 'rb') as f:
+        start, end = content_line_span(f, 0, limit)
+        for record in iter_content_records(f, start, end):
+            text = record.get('text', '')[:3000]
+            title = record.get('title', '')
+            url = record.get('url', '')
+            
+            classification = classifier.classify(text, url, title)
+            results.append({
+                "url": url,
+                "title": title,
+                "category": classification.category,
+                "confidence": classification.category_confidence,
+                "keywords": classification.keywords[:5],
+                "sentiment": classification.sentiment,
+                "word_count": classification.word_count
+            })
+    
+    return results
@@ -49,6 +49,12 @@ class CrawlerConfig(BaseSettings):
     respect_nofollow: bool = Field(default=True, description="Respect nofollow attributes")
     parse_sitemaps: bool = Field(default=True, description="Parse and use sitemaps")
     
+    # Parsing
+    parse_workers: Optional[int] = Field(
+        default=None,
+        description="HTML parser processes (None = CPU count, 0 = parse in the event loop)"
+    )
+    
     # User-Agent
     user_agent: Optional[str] = Field(
         default=None,
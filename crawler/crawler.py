@@ -9,8 +9,10 @@ Features:
 """
 
 import asyncio
+import multiprocessing
 import signal
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
@@ -24,7 +26,7 @@ from rich.table import Table
 
 from .config import CrawlerConfig, DomainConfig
 from .fetcher import HTTPFetcher, FetchResult
-from .frontier import URLFrontier, Priority, URLItem, get_domain
+from .frontier import URLFrontier, Priority, URLItem, get_domain, normalize_url
 from .parser import HTMLParser, ParsedPage
 from .renderer import BrowserRenderer, RenderResult
 from .robots import RobotsManager
@@ -32,6 +34,58 @@ from .sitemap import SitemapManager
 from .storage import StorageManager
 
 
+def _parse_worker(url: str, html: str) -> ParsedPage:
+    """Parse a page in a pool process; the result is pickled back."""
+    return HTMLParser(url).parse(html)
+
+
+# Parser processes shared by every crawler in this process, created on first use
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_parse_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Get the shared parser process pool, creating it on first use.
+    
+    The first caller's max_workers (None = CPU count) sizes the pool.
+    """
+    global _parse_pool
+    if _parse_pool is None:
+        # Spawned rather than forked since other threads are already running
+        _parse_pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+    return _parse_pool
+
+
+def shutdown_parse_pool() -> None:
+    """Shut down the shared parser process pool, if it was started."""
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
+
+
+# Normalized seed URLs of the crawls running in this process; API, "run now"
+# and scheduled crawls all claim their seed here before starting
+_active_seeds: set[str] = set()
+
+
+def claim_seed(url: str) -> bool:
+    """Mark a seed URL as being crawled. Returns False if it already is."""
+    key = normalize_url(url) or url
+    if key in _active_seeds:
+        return False
+    _active_seeds.add(key)
+    return True
+
+
+def release_seed(url: str) -> None:
+    """Release a seed URL claimed with claim_seed once its crawl has finished."""
+    _active_seeds.discard(normalize_url(url) or url)
+
+
 @dataclass
 class CrawlStats:
     """Crawl statistics."""
@@ -63,6 +117,7 @@ class Crawler:
         self.robots = RobotsManager()
         self.sitemap = SitemapManager()
         self.storage: Optional[StorageManager] = None
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
         
         # Domain tracking
         self._domain_configs: dict[str, DomainConfig] = {}
@@ -73,6 +128,8 @@ class Crawler:
         # Control
         self._running = False
         self._shutdown_event = asyncio.Event()
+        # Set whenever a URL finishes, so progress reporters can wake on change
+        self.progress_event = asyncio.Event()
     
     async def _init_components(self) -> None:
         """Initialize all crawl components."""
@@ -85,6 +142,11 @@ class Crawler:
             self.renderer = BrowserRenderer(self.config)
             await self.renderer.start()
         
+        # Parser processes, so page parsing doesn't stall the event loop;
+        # concurrent crawls share one pool
+        if self.config.parse_workers != 0:
+            self._parse_pool = get_parse_pool(self.config.parse_workers)
+        
         # Storage
         self.storage = StorageManager(
             self.config.db_path,
@@ -99,6 +161,8 @@ class Crawler:
             await self.renderer.stop()
         if self.storage:
             await self.storage.close()
+        # The shared parse pool outlives the crawl
+        self._parse_pool = None
     
     def _get_domain_config(self, url: str) -> DomainConfig:
         """Get or create domain configuration."""
@@ -178,7 +242,12 @@ class Crawler:
     ) -> ParsedPage:
         """Process page content and extract links."""
         parser = HTMLParser(url)
-        parsed = parser.parse(html)
+        if self._parse_pool:
+            parsed = await asyncio.get_running_loop().run_in_executor(
+                self._parse_pool, _parse_worker, url, html
+            )
+        else:
+            parsed = parser.parse(html)
         
         # Get crawlable links
         if depth < self.config.max_depth:
@@ -195,6 +264,16 @@ class Crawler:
                 depth=depth + 1,
                 parent_url=url
             )
+            
+            # Persist discovered URLs so the crawl can be resumed
+            await self.storage.db.add_urls_bulk(
+                self.storage.session_id,
+                [
+                    (normalized, depth + 1, url)
+                    for normalized in (normalize_url(link, url) for link in links)
+                    if normalized
+                ]
+            )
         
         return parsed
     
@@ -284,8 +363,17 @@ class Crawler:
             
             except Exception as e:
                 self.stats.pages_failed += 1
+                await self.storage.db.mark_url_crawled(
+                    self.storage.session_id,
+                    item.url,
+                    0,
+                    error=str(e)
+                )
                 await self.frontier.complete(item.url, success=False)
                 self.console.print(f"[red]Error processing {item.url}: {e}[/red]")
+            
+            finally:
+                self.progress_event.set()
     
     def _create_progress_table(self) -> Table:
         """Create progress display table."""
@@ -348,15 +436,17 @@ class Crawler:
                     await self.frontier.add(seed_url, Priority.HIGHEST, depth=0)
                 else:
                     # Load pending URLs
-                    pending = await self.storage.db.get_pending_urls(session_id)
+                    pending = await self.storage.db.claim_pending(session_id)
                     for p in pending:
                         await self.frontier.add(p['url'], Priority.NORMAL, p['depth'])
             else:
                 session_id = await self.storage.start_session(seed_url)
                 await self.frontier.add(seed_url, Priority.HIGHEST, depth=0)
             
-            # Add seed URL to database
-            await self.storage.db.add_url(session_id, seed_url, depth=0)
+            # Add seed URL to database, in the form it will be marked crawled under
+            await self.storage.db.add_url(
+                session_id, normalize_url(seed_url) or seed_url, depth=0
+            )
             
             # Process sitemaps
             domain = get_domain(seed_url)
@@ -398,12 +488,9 @@ class Crawler:
                 await asyncio.gather(*workers, return_exceptions=True)
             
             # Update session
-            await self.storage.db.update_session(
-                session_id,
-                status='completed',
-                pages_crawled=self.stats.pages_crawled,
-                pages_failed=self.stats.pages_failed
-            )
+            # Page counters are maintained by a trigger on the urls table, so they
+            # also cover the pages crawled before a resume
+            await self.storage.db.update_session(session_id, status='completed')
             
         finally:
             await self._cleanup()
@@ -12,6 +12,7 @@ import asyncio
 import hashlib
 import heapq
 import time
+from functools import lru_cache
 from dataclasses import dataclass, field
 from enum import IntEnum
 from typing import Optional, Set
@@ -85,7 +86,18 @@ def normalize_url(url: str, base_url: Optional[str] = None) -> Optional[str]:
         # Resolve relative URLs
         if base_url:
             url = urljoin(base_url, url)
-        
+    except Exception:
+        return None
+    
+    return _normalize_absolute(url)
+
+
+# The same links turn up on many pages (nav bars, footers); they are
+# memoized once resolved, so the page they appear on is not part of the key
+@lru_cache(maxsize=131_072)
+def _normalize_absolute(url: str) -> Optional[str]:
+    """Normalize an already-resolved URL (see normalize_url)."""
+    try:
         parsed = urlparse(url)
         
         # Skip non-HTTP(S) URLs
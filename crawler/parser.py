@@ -2,23 +2,51 @@
 HTML Parser - Content extraction and link discovery.
 
 Features:
-- BeautifulSoup + lxml parsing
+- lxml parsing (C-level tree building)
+- Incremental parsing for very large pages
 - Link extraction with URL normalization
 - Text content extraction
 - Metadata extraction (title, description, etc.)
 - Structured data detection (JSON-LD, microdata)
 """
 
-import json
-import re
 from dataclasses import dataclass, field
-from typing import Optional
+from functools import lru_cache
+from io import BytesIO
+from typing import Callable, Optional
 from urllib.parse import urljoin, urlparse
 
-from bs4 import BeautifulSoup, Comment
+import lxml.html
+import orjson
+from lxml import etree
 
 
-@dataclass
+# Parse from UTF-8 bytes so documents with an XML encoding declaration
+# are accepted and any <meta charset> is ignored (the text is decoded already)
+_LXML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+
+# Documents larger than this (in bytes) are parsed incrementally instead of
+# being built into a full tree
+STREAM_PARSE_THRESHOLD = 1 << 20
+
+# Selectors are compiled once per process rather than on every page
+_XP_TITLE = etree.XPath('(//title)[1]')
+_XP_CANONICAL = etree.XPath(
+    "//link[contains(concat(' ', normalize-space(@rel), ' '), ' canonical ')]/@href"
+)
+_XP_LINKS = etree.XPath('//a[@href]')
+_XP_FRAMES = etree.XPath('//frame[@src] | //iframe[@src]')
+_XP_JSONLD = etree.XPath("//script[@type='application/ld+json']")
+_XP_HEADINGS = etree.XPath('//h1 | //h2 | //h3 | //h4 | //h5 | //h6')
+_HEADING_TAGS = frozenset(f'h{i}' for i in range(1, 7))
+# Elements whose text bs4 get_text() leaves out of titles, links and headings
+_NON_TEXT_TAGS = frozenset(('script', 'style', 'template'))
+_XP_VISIBLE_TEXT = etree.XPath(
+    './/text()[not(ancestor::script or ancestor::style or ancestor::template)]'
+)
+
+
+@dataclass(slots=True)
 class PageMetadata:
     """Extracted page metadata."""
     title: Optional[str] = None
@@ -35,7 +63,7 @@ class PageMetadata:
     robots: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtractedLink:
     """An extracted link from a page."""
     url: str
@@ -45,7 +73,7 @@ class ExtractedLink:
     link_type: str  # 'anchor', 'form', 'frame', etc.
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedPage:
     """Complete parsed page data."""
     url: str
@@ -83,25 +111,33 @@ class HTMLParser:
         Returns:
             ParsedPage with extracted data
         """
-        soup = BeautifulSoup(html, 'lxml')
+        data = html.encode('utf-8', 'replace')
+        if len(data) > STREAM_PARSE_THRESHOLD:
+            return self._parse_stream(data)
+        
+        try:
+            tree = lxml.html.document_fromstring(data, parser=_LXML_PARSER)
+        except etree.ParserError:
+            # Empty or whitespace-only document
+            return self._empty_page()
         
         # Extract metadata
-        metadata = self._extract_metadata(soup)
+        metadata = self._extract_metadata(tree)
         
         # Extract structured data BEFORE text extraction (which destroys scripts)
-        structured_data = self._extract_structured_data(soup)
+        structured_data = self._extract_structured_data(tree)
         
         # Extract links BEFORE text extraction
-        links = self._extract_links(soup)
+        links = self._extract_links(tree)
         
         # Extract headings BEFORE text extraction
-        headings = self._extract_headings(soup)
+        headings = self._extract_headings(tree)
         
         # Extract images
-        images = self._extract_images(soup)
+        images = self._extract_images(tree)
         
         # Extract text content (destroys unwanted elements)
-        text_content = self._extract_text(soup)
+        text_content = self._extract_text(tree)
         
         return ParsedPage(
             url=self.base_url,
@@ -113,167 +149,340 @@ class HTMLParser:
             images=images
         )
     
-    def _extract_metadata(self, soup: BeautifulSoup) -> PageMetadata:
+    def _empty_page(self) -> ParsedPage:
+        """Result for a document with no content."""
+        return ParsedPage(
+            url=self.base_url,
+            metadata=PageMetadata(),
+            text_content='',
+            headings={f'h{i}': [] for i in range(1, 7)}
+        )
+    
+    def _parse_stream(self, data: bytes) -> ParsedPage:
+        """
+        Parse a large document without holding its whole tree.
+        
+        Gives the same result as the tree-based path. Each element's text is
+        folded into its parent when it ends and the element is then cleared,
+        so only the currently open elements stay in memory.
+        """
+        metadata = PageMetadata()
+        anchors: list[ExtractedLink] = []
+        frames: list[ExtractedLink] = []
+        structured_data: list[dict] = []
+        heading_slots: list[list] = []
+        images: list[dict] = []
+        title_found = False
+        
+        # Elements whose text is filled in at their end event, and how many
+        # of those (plus titles) are open; stripped text is only built then
+        awaiting: dict = {}
+        open_wanting_text = 0
+        # Finished elements not yet folded into their parent:
+        # (text as _strip_join gives it, text for the page content)
+        folded: dict = {}
+        root = None
+        root_text = ''
+        # libxml2 keeps elements after </html> as siblings of the root: the
+        # XPath lookups of the tree-based path see them, iter() and text don't
+        past_root = False
+        
+        events = etree.iterparse(
+            BytesIO(data), events=('start', 'end'),
+            html=True, recover=True, encoding='utf-8'
+        )
+        try:
+            for event, element in events:
+                tag = element.tag
+                
+                if event == 'start':
+                    if root is None:
+                        root = element
+                        metadata.language = element.get('lang')
+                    
+                    if tag == 'a':
+                        link = self._anchor_link(element)
+                        if link:
+                            anchors.append(link)
+                            awaiting[element] = link
+                    elif tag in ('frame', 'iframe'):
+                        link = self._frame_link(element)
+                        if link:
+                            frames.append(link)
+                    elif tag in _HEADING_TAGS:
+                        slot = [tag, '']
+                        heading_slots.append(slot)
+                        awaiting[element] = slot
+                    elif tag == 'meta' and not past_root:
+                        self._apply_meta(metadata, element)
+                    elif tag == 'link' and metadata.canonical_url is None:
+                        href = element.get('href')
+                        if href is not None and 'canonical' in (element.get('rel') or '').split():
+                            metadata.canonical_url = href
+                    elif tag == 'img' and not past_root and len(images) < 50:
+                        image = self._image_info(element)
+                        if image:
+                            images.append(image)
+                    
+                    if tag == 'title' or element in awaiting:
+                        open_wanting_text += 1
+                    continue
+                
+                # End event: all of this element's content is now known
+                # Ignored children and comments drop out of the page text and
+                # their tail joins the text before them, spaced apart as in
+                # the tree path
+                want_stripped = open_wanting_text > 0
+                stripped = [element.text.strip()] if want_stripped and element.text else []
+                content = []
+                preceding = element.text or ''
+                for child in element:
+                    child_stripped, child_content = folded.pop(child, ('', ''))
+                    if want_stripped:
+                        if child.tag not in _NON_TEXT_TAGS:
+                            stripped.append(child_stripped)
+                        if child.tail:
+                            stripped.append(child.tail.strip())
+                    if child.tag in self.IGNORE_TAGS or child.tag is etree.Comment:
+                        if child.tail:
+                            preceding += ' ' + child.tail
+                    else:
+                        content += (preceding, child_content)
+                        preceding = child.tail or ''
+                content.append(preceding)
+                stripped = ''.join(stripped)
+                content = ' '.join(content)
+                
+                if tag == 'title' or element in awaiting:
+                    open_wanting_text -= 1
+                
+                if element in awaiting:
+                    target = awaiting.pop(element)
+                    if isinstance(target, ExtractedLink):
+                        target.text = stripped[:200]
+                    else:
+                        target[1] = stripped
+                elif tag == 'title' and not title_found:
+                    metadata.title = stripped
+                    title_found = True
+                elif tag == 'script' and element.get('type') == 'application/ld+json':
+                    self._load_json_ld(element.text, structured_data)
+                
+                if element is root:
+                    root_text = content
+                    past_root = True
+                elif element.getparent() is not None:
+                    folded[element] = (stripped, content)
+                element.clear(keep_tail=True)
+        except etree.XMLSyntaxError:
+            # Nothing parseable in the document
+            return self._empty_page()
+        
+        headings = {f'h{i}': [] for i in range(1, 7)}
+        for tag, text in heading_slots:
+            if text:
+                headings[tag].append(text[:200])
+        
+        return ParsedPage(
+            url=self.base_url,
+            metadata=metadata,
+            text_content=' '.join(root_text.split()),
+            links=anchors + frames,
+            structured_data=structured_data,
+            headings=headings,
+            images=images
+        )
+    
+    @staticmethod
+    def _strip_join(element) -> str:
+        """Join an element's stripped text fragments (like bs4 get_text(strip=True)).
+        
+        Text inside script, style and template elements is skipped, as are comments.
+        """
+        return ''.join(s.strip() for s in _XP_VISIBLE_TEXT(element))
+    
+    def _extract_metadata(self, tree) -> PageMetadata:
         """Extract page metadata from head section."""
         metadata = PageMetadata()
         
         # Title
-        title_tag = soup.find('title')
+        title_tag = _XP_TITLE(tree)
         if title_tag:
-            metadata.title = title_tag.get_text(strip=True)
+            metadata.title = self._strip_join(title_tag[0])
         
         # Meta tags
-        for meta in soup.find_all('meta'):
-            name = (meta.get('name') or meta.get('property') or '').lower()
-            content = meta.get('content', '')
-            
-            if name == 'description':
-                metadata.description = content
-            elif name == 'keywords':
-                metadata.keywords = [k.strip() for k in content.split(',')]
-            elif name == 'author':
-                metadata.author = content
-            elif name == 'robots':
-                metadata.robots = content
-            elif name == 'og:title':
-                metadata.og_title = content
-            elif name == 'og:description':
-                metadata.og_description = content
-            elif name == 'og:image':
-                metadata.og_image = content
-            elif name == 'og:type':
-                metadata.og_type = content
-            elif name == 'twitter:card':
-                metadata.twitter_card = content
+        for meta in tree.iter('meta'):
+            self._apply_meta(metadata, meta)
         
         # Canonical URL
-        canonical = soup.find('link', rel='canonical')
+        canonical = _XP_CANONICAL(tree)
         if canonical:
-            metadata.canonical_url = canonical.get('href')
+            metadata.canonical_url = str(canonical[0])
         
         # Language
-        html_tag = soup.find('html')
-        if html_tag:
-            metadata.language = html_tag.get('lang')
+        metadata.language = tree.get('lang')
         
         return metadata
     
-    def _extract_text(self, soup: BeautifulSoup) -> str:
+    @staticmethod
+    def _apply_meta(metadata: PageMetadata, meta) -> None:
+        """Copy a <meta> tag's content onto the matching metadata field."""
+        name = (meta.get('name') or meta.get('property') or '').lower()
+        content = meta.get('content', '')
+        
+        if name == 'description':
+            metadata.description = content
+        elif name == 'keywords':
+            metadata.keywords = [k.strip() for k in content.split(',')]
+        elif name == 'author':
+            metadata.author = content
+        elif name == 'robots':
+            metadata.robots = content
+        elif name == 'og:title':
+            metadata.og_title = content
+        elif name == 'og:description':
+            metadata.og_description = content
+        elif name == 'og:image':
+            metadata.og_image = content
+        elif name == 'og:type':
+            metadata.og_type = content
+        elif name == 'twitter:card':
+            metadata.twitter_card = content
+    
+    def _extract_text(self, tree) -> str:
         """Extract clean text content from page."""
-        # Remove unwanted elements
-        for tag in soup.find_all(self.IGNORE_TAGS):
-            tag.decompose()
-        
-        # Remove comments
-        for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
-            comment.extract()
-        
-        # Get text
-        text = soup.get_text(separator=' ', strip=True)
-        
-        # Clean up whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        return text.strip()
+        # Remove unwanted elements and comments, keeping the text that follows
+        # them; that text is merged into what came before, so space it apart
+        for element in tree.iter(etree.Comment, *self.IGNORE_TAGS):
+            if element.tail:
+                element.tail = ' ' + element.tail
+        etree.strip_elements(tree, *self.IGNORE_TAGS, etree.Comment, with_tail=False)
+        
+        # Get text; split()/join collapses whitespace runs and trims the ends
+        return ' '.join(' '.join(tree.itertext()).split())
     
-    def _extract_links(self, soup: BeautifulSoup) -> list[ExtractedLink]:
+    def _extract_links(self, tree) -> list[ExtractedLink]:
         """Extract all links from page."""
         links = []
         
         # Anchor links
-        for anchor in soup.find_all('a', href=True):
-            href = anchor.get('href', '')
-            
-            # Skip javascript and mailto links
-            if href.startswith(('javascript:', 'mailto:', 'tel:', '#')):
-                continue
-            
-            # Normalize URL
-            absolute_url = urljoin(self.base_url, href)
-            
-            # Check if internal
-            link_domain = urlparse(absolute_url).netloc.lower()
-            is_internal = link_domain == self.base_domain
-            
-            # Check nofollow
-            rel = anchor.get('rel', [])
-            if isinstance(rel, str):
-                rel = rel.split()
-            nofollow = 'nofollow' in rel
-            
-            # Get link text
-            text = anchor.get_text(strip=True)
-            
-            links.append(ExtractedLink(
-                url=absolute_url,
-                text=text[:200],  # Limit text length
-                is_internal=is_internal,
-                nofollow=nofollow,
-                link_type='anchor'
-            ))
+        for anchor in _XP_LINKS(tree):
+            link = self._anchor_link(anchor)
+            if link:
+                # Get link text
+                link.text = self._strip_join(anchor)[:200]  # Limit text length
+                links.append(link)
         
         # Frame/iframe sources
-        for frame in soup.find_all(['frame', 'iframe'], src=True):
-            src = frame.get('src', '')
-            if src and not src.startswith('javascript:'):
-                absolute_url = urljoin(self.base_url, src)
-                link_domain = urlparse(absolute_url).netloc.lower()
-                
-                links.append(ExtractedLink(
-                    url=absolute_url,
-                    text='',
-                    is_internal=link_domain == self.base_domain,
-                    nofollow=False,
-                    link_type='frame'
-                ))
+        for frame in _XP_FRAMES(tree):
+            link = self._frame_link(frame)
+            if link:
+                links.append(link)
         
         return links
     
-    def _extract_structured_data(self, soup: BeautifulSoup) -> list[dict]:
+    def _anchor_link(self, anchor) -> Optional[ExtractedLink]:
+        """Build the link for an <a> tag (text is filled in by the caller)."""
+        href = anchor.get('href')
+        
+        # Skip javascript and mailto links
+        if href is None or href.startswith(('javascript:', 'mailto:', 'tel:', '#')):
+            return None
+        
+        # Normalize URL
+        absolute_url = urljoin(self.base_url, href)
+        
+        # Check if internal
+        link_domain = urlparse(absolute_url).netloc.lower()
+        is_internal = link_domain == self.base_domain
+        
+        # Check nofollow
+        nofollow = 'nofollow' in anchor.get('rel', '').split()
+        
+        return ExtractedLink(
+            url=absolute_url,
+            text='',
+            is_internal=is_internal,
+            nofollow=nofollow,
+            link_type='anchor'
+        )
+    
+    def _frame_link(self, frame) -> Optional[ExtractedLink]:
+        """Build the link for a frame/iframe source."""
+        src = frame.get('src', '')
+        if not src or src.startswith('javascript:'):
+            return None
+        
+        absolute_url = urljoin(self.base_url, src)
+        link_domain = urlparse(absolute_url).netloc.lower()
+        
+        return ExtractedLink(
+            url=absolute_url,
+            text='',
+            is_internal=link_domain == self.base_domain,
+            nofollow=False,
+            link_type='frame'
+        )
+    
+    def _extract_structured_data(self, tree) -> list[dict]:
         """Extract JSON-LD and other structured data."""
         structured_data = []
         
         # JSON-LD
-        for script in soup.find_all('script', type='application/ld+json'):
-            try:
-                data = json.loads(script.string)
-                if isinstance(data, list):
-                    structured_data.extend(data)
-                else:
-                    structured_data.append(data)
-            except (json.JSONDecodeError, TypeError):
-                pass
+        for script in _XP_JSONLD(tree):
+            self._load_json_ld(script.text, structured_data)
         
         return structured_data
     
-    def _extract_headings(self, soup: BeautifulSoup) -> dict[str, list[str]]:
+    @staticmethod
+    def _load_json_ld(text: Optional[str], structured_data: list[dict]) -> None:
+        """Append the item(s) of one JSON-LD block, skipping invalid JSON."""
+        try:
+            data = orjson.loads(text)
+            if isinstance(data, list):
+                structured_data.extend(data)
+            else:
+                structured_data.append(data)
+        except orjson.JSONDecodeError:
+            pass
+    
+    def _extract_headings(self, tree) -> dict[str, list[str]]:
         """Extract heading structure."""
         headings = {f'h{i}': [] for i in range(1, 7)}
         
-        for i in range(1, 7):
-            for heading in soup.find_all(f'h{i}'):
-                text = heading.get_text(strip=True)
-                if text:
-                    headings[f'h{i}'].append(text[:200])
+        for heading in _XP_HEADINGS(tree):
+            text = self._strip_join(heading)
+            if text:
+                headings[heading.tag].append(text[:200])
         
         return headings
     
-    def _extract_images(self, soup: BeautifulSoup) -> list[dict]:
+    def _extract_images(self, tree) -> list[dict]:
         """Extract image information."""
         images = []
         
-        for img in soup.find_all('img'):
-            src = img.get('src') or img.get('data-src')
-            if not src:
+        for img in tree.iter('img'):
+            image = self._image_info(img)
+            if not image:
                 continue
             
-            images.append({
-                'src': urljoin(self.base_url, src),
-                'alt': img.get('alt', ''),
-                'title': img.get('title', ''),
-            })
+            images.append(image)
+            if len(images) == 50:  # Limit to 50 images
+                break
         
-        return images[:50]  # Limit to 50 images
+        return images
+    
+    def _image_info(self, img) -> Optional[dict]:
+        """Describe an <img> tag, or None if it has no source."""
+        src = img.get('src') or img.get('data-src')
+        if not src:
+            return None
+        
+        return {
+            'src': urljoin(self.base_url, src),
+            'alt': img.get('alt', ''),
+            'title': img.get('title', ''),
+        }
     
     def get_crawlable_links(
         self,
@@ -298,21 +507,19 @@ class HTMLParser:
             if 'nofollow' in robots:
                 return []  # Don't follow any links
         
-        urls = []
-        seen = set()
+        keep = _link_filter(respect_nofollow, internal_only)
         
-        for link in parsed.links:
-            # Skip if configured
-            if respect_nofollow and link.nofollow:
-                continue
-            if internal_only and not link.is_internal:
-                continue
-            
-            # Deduplicate
-            if link.url in seen:
-                continue
-            seen.add(link.url)
-            
-            urls.append(link.url)
-        
-        return urls
+        # dict.fromkeys drops duplicate URLs while keeping first-seen order
+        return list(dict.fromkeys(link.url for link in parsed.links if keep(link)))
+
+
+@lru_cache(maxsize=None)
+def _link_filter(respect_nofollow: bool, internal_only: bool) -> Callable[[ExtractedLink], bool]:
+    """Build the link predicate for one combination of crawl options."""
+    if respect_nofollow and internal_only:
+        return lambda link: link.is_internal and not link.nofollow
+    if respect_nofollow:
+        return lambda link: not link.nofollow
+    if internal_only:
+        return lambda link: link.is_internal
+    return lambda link: True
@@ -10,9 +10,10 @@ Features:
 
 import asyncio
 import re
+from hashlib import blake2b
 from dataclasses import dataclass, field
 from typing import Optional
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin
 
 
 @dataclass
@@ -23,6 +24,86 @@ class RobotsRules:
     disallowed: list[str] = field(default_factory=list)
     crawl_delay: Optional[float] = None
     sitemaps: list[str] = field(default_factory=list)
+    
+    # Compiled form of allowed/disallowed, see _compile_rules()
+    _matchers: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    # Memoized is_allowed() results by path
+    _verdicts: dict[str, bool] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+
+# "Directive: value" lines we act on; the value stops at a comment or line end
+_DIRECTIVE_RE = re.compile(
+    r'^[ \t]*(user-agent|allow|disallow|crawl-delay|sitemap)[ \t]*:([^#\r\n]*)',
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Scheme and authority of an absolute URL, then its path and query
+_URL_PATH_RE = re.compile(r'[A-Za-z][A-Za-z0-9+.-]*://[^/?#]*([^?#]*)(?:\?([^#]*))?')
+
+# Upper bound on memoized is_allowed() results per rule set
+VERDICT_CACHE_SIZE = 4096
+
+# Upper bound on distinct robots.txt bodies remembered per parser
+PARSED_CACHE_SIZE = 1024
+
+
+def _pattern_to_regex(pattern: str) -> str:
+    """Translate a robots.txt path pattern (* and trailing $) to a regex."""
+    anchored = pattern.endswith('$')
+    body = pattern[:-1] if anchored else pattern
+    regex = ''.join('.*' if char == '*' else re.escape(char) for char in body)
+    return regex + r'\Z' if anchored else regex
+
+
+# Marks the end of a literal pattern in a prefix trie (never a path char)
+_TRIE_END = ''
+
+
+def _fast_path(url: str) -> str:
+    """Path and query of a URL for rule matching; paths pass through as-is."""
+    if url.startswith('/'):
+        return url
+    match = _URL_PATH_RE.match(url)
+    if not match:
+        return url
+    path, query = match.groups()
+    path = path or '/'
+    return f'{path}?{query}' if query else path
+
+
+def _compile_rules(rules: RobotsRules) -> tuple:
+    """
+    Compile a rule set for matching.
+    
+    Returns (disallow_re, allow_re, disallows, allows). The two regexes are
+    alternations of every pattern and answer "does anything match" in one
+    pass. disallows/allows are only consulted when both sides match; each
+    is (trie, wildcards): literal prefixes in a character trie, and patterns
+    with * or $ as (regex, pattern length) sorted longest first.
+    """
+    def build(patterns: list[str]):
+        if not patterns:
+            return None, ({}, [])
+        regexes = [_pattern_to_regex(p) for p in patterns]
+        combined = re.compile('|'.join(f'(?:{r})' for r in regexes))
+        
+        trie: dict = {}
+        wildcards = []
+        for pattern, regex in zip(patterns, regexes):
+            if '*' in pattern or pattern.endswith('$'):
+                wildcards.append((re.compile(regex), len(pattern)))
+                continue
+            node = trie
+            for char in pattern:
+                node = node.setdefault(char, {})
+            node[_TRIE_END] = True
+        
+        wildcards.sort(key=lambda item: item[1], reverse=True)
+        return combined, (trie, wildcards)
+    
+    disallow_re, disallows = build(rules.disallowed)
+    allow_re, allows = build(rules.allowed)
+    return disallow_re, allow_re, disallows, allows
 
 
 class RobotsParser:
@@ -34,7 +115,10 @@ class RobotsParser:
     
     def __init__(self, user_agent: str = "*"):
         self.user_agent = user_agent
-        self._cache: dict[str, RobotsRules] = {}
+        self._agent = user_agent.lower()
+        # Parsed groups and raw sitemap values keyed by content digest, so
+        # identical files served by many hosts are only parsed once
+        self._cache: dict[bytes, tuple[RobotsRules, list[str]]] = {}
         self._lock = asyncio.Lock()
     
     def parse(self, content: str, base_url: str) -> RobotsRules:
@@ -48,6 +132,28 @@ class RobotsParser:
         Returns:
             RobotsRules object with parsed rules
         """
+        key = blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=8).digest()
+        cached = self._cache.get(key)
+        if cached is None:
+            cached = self._parse_content(content)
+            if len(self._cache) >= PARSED_CACHE_SIZE:
+                self._cache.clear()
+            self._cache[key] = cached
+        template, sitemap_values = cached
+        
+        # Sitemaps resolve against the requesting host; the rest is shared
+        rules = RobotsRules(
+            user_agent=self.user_agent,
+            allowed=template.allowed,
+            disallowed=template.disallowed,
+            crawl_delay=template.crawl_delay,
+            sitemaps=[urljoin(base_url, value) for value in sitemap_values]
+        )
+        rules._matchers = template._matchers
+        return rules
+    
+    def _parse_content(self, content: str) -> tuple[RobotsRules, list[str]]:
+        """Extract the rules that apply to us and the raw sitemap values."""
         rules = RobotsRules(user_agent=self.user_agent)
         current_agents: list[str] = []
         applies_to_us = False
@@ -55,19 +161,11 @@ class RobotsParser:
         # Track sitemaps (global, not per user-agent)
         sitemaps: list[str] = []
         
-        for line in content.split('\n'):
-            # Remove comments and strip whitespace
-            line = line.split('#')[0].strip()
-            if not line:
-                continue
-            
-            # Parse directive
-            if ':' not in line:
-                continue
-            
-            directive, value = line.split(':', 1)
-            directive = directive.strip().lower()
-            value = value.strip()
+        # One regex pass pulls out every known directive; comments and
+        # unknown lines never match
+        for match in _DIRECTIVE_RE.finditer(content):
+            directive = match.group(1).lower()
+            value = match.group(2).strip()
             
             if directive == 'user-agent':
                 # New user-agent block
@@ -93,16 +191,15 @@ class RobotsParser:
             
             elif directive == 'sitemap':
                 # Sitemap URLs are global
-                sitemap_url = urljoin(base_url, value)
-                sitemaps.append(sitemap_url)
+                sitemaps.append(value)
         
-        rules.sitemaps = sitemaps
-        return rules
+        rules._matchers = _compile_rules(rules)
+        return rules, sitemaps
     
     def _matches_user_agent(self, pattern: str) -> bool:
         """Check if a user-agent pattern matches our agent."""
         pattern = pattern.lower()
-        agent = self.user_agent.lower()
+        agent = self._agent
         
         if pattern == '*':
             return True
@@ -115,51 +212,59 @@ class RobotsParser:
         Check if a path is allowed according to rules.
         
         Uses the most specific matching rule (longest match wins).
+        Accepts either a path or a full URL.
         """
         # Empty rules = everything allowed
         if not rules.allowed and not rules.disallowed:
             return True
         
-        # Find matching rules
-        allow_match = -1
-        disallow_match = -1
-        
-        for pattern in rules.allowed:
-            if self._path_matches(path, pattern):
-                allow_match = max(allow_match, len(pattern))
-        
-        for pattern in rules.disallowed:
-            if self._path_matches(path, pattern):
-                disallow_match = max(disallow_match, len(pattern))
+        path = _fast_path(path)
+        verdict = rules._verdicts.get(path)
+        if verdict is None:
+            verdict = self._match(rules, path)
+            if len(rules._verdicts) >= VERDICT_CACHE_SIZE:
+                rules._verdicts.clear()
+            rules._verdicts[path] = verdict
+        return verdict
+    
+    @staticmethod
+    def _match(rules: RobotsRules, path: str) -> bool:
+        """Evaluate the compiled rules against a path."""
+        if rules._matchers is None:
+            rules._matchers = _compile_rules(rules)
+        disallow_re, allow_re, disallows, allows = rules._matchers
         
-        # Longest match wins; allow wins ties
-        if allow_match >= disallow_match:
+        if disallow_re is None or not disallow_re.match(path):
             return True
-        return disallow_match == -1
+        if allow_re is None or not allow_re.match(path):
+            return False
+        
+        # Both sides match: longest match wins; allow wins ties
+        allow_match = RobotsParser._longest_match(allows, path)
+        disallow_match = RobotsParser._longest_match(disallows, path)
+        return allow_match >= disallow_match
     
-    def _path_matches(self, path: str, pattern: str) -> bool:
-        """
-        Check if a path matches a robots.txt pattern.
+    @staticmethod
+    def _longest_match(side: tuple, path: str) -> int:
+        """Length of the longest pattern on one side of a rule set matching path."""
+        trie, wildcards = side
+        longest = 0
         
-        Supports * and $ wildcards.
-        """
-        # Convert pattern to regex
-        regex = ''
-        i = 0
-        while i < len(pattern):
-            char = pattern[i]
-            if char == '*':
-                regex += '.*'
-            elif char == '$' and i == len(pattern) - 1:
-                regex += '$'
-            else:
-                regex += re.escape(char)
-            i += 1
+        # One walk down the trie finds the longest literal prefix
+        node = trie
+        for depth, char in enumerate(path, 1):
+            node = node.get(char)
+            if node is None:
+                break
+            if _TRIE_END in node:
+                longest = depth
         
-        try:
-            return bool(re.match(regex, path))
-        except re.error:
-            return False
+        for regex, length in wildcards:
+            if length <= longest:
+                break
+            if regex.match(path):
+                return length
+        return longest
     
     async def can_fetch(self, url: str, rules: RobotsRules) -> bool:
         """
@@ -172,12 +277,7 @@ class RobotsParser:
         Returns:
             True if allowed, False otherwise
         """
-        parsed = urlparse(url)
-        path = parsed.path or '/'
-        if parsed.query:
-            path += '?' + parsed.query
-        
-        return self.is_allowed(rules, path)
+        return self.is_allowed(rules, url)
     
     def get_crawl_delay(self, rules: RobotsRules) -> Optional[float]:
         """Get crawl-delay from rules."""
@@ -238,6 +338,11 @@ class RobotsManager:
         
         return rules
     
+    async def can_fetch(self, url: str, rules: RobotsRules) -> bool:
+        """Check if a URL can be fetched according to a domain's rules."""
+        return await self.parser.can_fetch(url, rules)
+    
     def clear_cache(self) -> None:
         """Clear the robots.txt cache."""
         self._cache.clear()
+        self.parser._cache.clear()
@@ -24,7 +24,7 @@ from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.date import DateTrigger
 
 from .config import CrawlerConfig
-from .crawler import Crawler
+from .crawler import Crawler, claim_seed, release_seed
 
 
 class ScheduleType(str, Enum):
@@ -78,6 +78,9 @@ class SchedulerDatabase:
     def __init__(self, db_path: Path):
         self.db_path = db_path
         self._conn: Optional[sqlite3.Connection] = None
+        # Bumped on every write to the schedules table, so callers can
+        # cache views of it
+        self.generation = 0
     
     def connect(self) -> None:
         """Initialize database connection and schema."""
@@ -144,6 +147,7 @@ class SchedulerDatabase:
             config.status.value
         ))
         self._conn.commit()
+        self.generation += 1
         return cursor.lastrowid
     
     def get_schedule(self, schedule_id: int) -> Optional[ScheduleConfig]:
@@ -180,6 +184,7 @@ class SchedulerDatabase:
             f"UPDATE schedules SET {set_clause} WHERE id = ?", values
         )
         self._conn.commit()
+        self.generation += 1
         return cursor.rowcount > 0
     
     def delete_schedule(self, schedule_id: int) -> bool:
@@ -188,6 +193,7 @@ class SchedulerDatabase:
             "DELETE FROM schedules WHERE id = ?", (schedule_id,)
         )
         self._conn.commit()
+        self.generation += 1
         return cursor.rowcount > 0
     
     def record_run_start(self, schedule_id: int) -> int:
@@ -203,6 +209,7 @@ class SchedulerDatabase:
         """, (datetime.now().isoformat(), schedule_id))
         
         self._conn.commit()
+        self.generation += 1
         return cursor.lastrowid
     
     def record_run_complete(
@@ -342,6 +349,11 @@ class CrawlScheduler:
         """Get all schedules."""
         return self.db.get_all_schedules()
     
+    @property
+    def generation(self) -> int:
+        """Changes whenever any schedule is created, updated or deleted."""
+        return self.db.generation
+    
     def get_schedule_runs(self, schedule_id: int) -> list[dict]:
         """Get runs for a schedule."""
         return self.db.get_schedule_runs(schedule_id)
@@ -395,6 +407,11 @@ class CrawlScheduler:
         # Record run start
         run_id = self.db.record_run_start(schedule_id)
         
+        # Skip the run while another crawl of the same seed is in progress
+        if not claim_seed(config.url):
+            self.db.record_run_complete(run_id, 0, 0, "A crawl for this URL is already running")
+            return
+        
         try:
             # Create crawler config
             crawler_config = CrawlerConfig(
@@ -426,6 +443,8 @@ class CrawlScheduler:
         
         except Exception as e:
             self.db.record_run_complete(run_id, 0, 0, str(e))
+        finally:
+            release_seed(config.url)
 
 
 # Global scheduler instance
@@ -15,9 +15,78 @@ requiring Elasticsearch or other external services.
 import re
 import sqlite3
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+import orjson
+
+
+# Insert a page, or refresh it if the URL is already indexed
+UPSERT_PAGE_SQL = """
+    INSERT INTO indexed_pages 
+    (url, title, content, description, domain, session_id, word_count)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(url) DO UPDATE SET
+        title = excluded.title,
+        content = excluded.content,
+        description = excluded.description,
+        session_id = excluded.session_id,
+        word_count = excluded.word_count,
+        indexed_at = CURRENT_TIMESTAMP
+"""
+
+
+# Removes deleted pages from the FTS index; dropped during bulk deletes
+PAGES_AD_TRIGGER_SQL = """
+    CREATE TRIGGER IF NOT EXISTS pages_ad AFTER DELETE ON indexed_pages BEGIN
+        INSERT INTO pages_fts(pages_fts, rowid, url, title, content, description)
+        VALUES ('delete', old.id, old.url, old.title, old.content, old.description);
+    END
+"""
+
+# Sessions making up at least this share of the index are deleted with a
+# single FTS rebuild: re-indexing the pages that remain is then cheaper than
+# removing each deleted page from the FTS index
+BULK_DELETE_FRACTION = 0.5
+
+# Storage limits for indexed text, in UTF-8 bytes
+MAX_CONTENT_BYTES = 50_000
+MAX_DESCRIPTION_BYTES = 1_000
+
+_WORD_RE = re.compile(r'\S+')
+
+
+def _truncate_bytes(text: str, max_bytes: int) -> str:
+    """Truncate text to at most max_bytes of UTF-8."""
+    # Every code point is at most 4 bytes, so short strings can skip encoding
+    if len(text) * 4 <= max_bytes:
+        return text
+    return text.encode('utf-8')[:max_bytes].decode('utf-8', 'ignore')
+
+
+def _count_words(text: str) -> int:
+    """Count whitespace-separated words without building a list."""
+    return sum(1 for _ in _WORD_RE.finditer(text))
+
+
+@lru_cache(maxsize=4096)
+def _netloc(prefix: str) -> str:
+    """Parse the netloc of a scheme://host prefix."""
+    try:
+        return urlsplit(prefix).netloc
+    except ValueError:
+        return ""
+
+
+def _extract_domain(url: str) -> str:
+    """Extract domain from URL."""
+    # Cache on the scheme://host prefix so every page of a site shares an entry
+    start = url.find('//')
+    end = url.find('/', start + 2) if start >= 0 else -1
+    return _netloc(url[:end] if end >= 0 else url)
 
 
 @dataclass
@@ -75,8 +144,13 @@ class SearchIndex:
                 indexed_at TEXT DEFAULT CURRENT_TIMESTAMP
             );
             
-            CREATE INDEX IF NOT EXISTS idx_pages_domain ON indexed_pages(domain);
-            CREATE INDEX IF NOT EXISTS idx_pages_session ON indexed_pages(session_id);
+            -- Partial indexes matching the get_stats filters
+            DROP INDEX IF EXISTS idx_pages_domain;
+            DROP INDEX IF EXISTS idx_pages_session;
+            CREATE INDEX IF NOT EXISTS idx_pages_domain_partial
+                ON indexed_pages(domain) WHERE domain != '';
+            CREATE INDEX IF NOT EXISTS idx_pages_session_partial
+                ON indexed_pages(session_id) WHERE session_id IS NOT NULL;
         """)
         
         # Create FTS5 virtual table for full-text search
@@ -97,17 +171,13 @@ class SearchIndex:
             pass
         
         # Create triggers to keep FTS in sync
+        self._conn.execute(PAGES_AD_TRIGGER_SQL)
         self._conn.executescript("""
             CREATE TRIGGER IF NOT EXISTS pages_ai AFTER INSERT ON indexed_pages BEGIN
                 INSERT INTO pages_fts(rowid, url, title, content, description)
                 VALUES (new.id, new.url, new.title, new.content, new.description);
             END;
             
-            CREATE TRIGGER IF NOT EXISTS pages_ad AFTER DELETE ON indexed_pages BEGIN
-                INSERT INTO pages_fts(pages_fts, rowid, url, title, content, description)
-                VALUES ('delete', old.id, old.url, old.title, old.content, old.description);
-            END;
-            
             CREATE TRIGGER IF NOT EXISTS pages_au AFTER UPDATE ON indexed_pages BEGIN
                 INSERT INTO pages_fts(pages_fts, rowid, url, title, content, description)
                 VALUES ('delete', old.id, old.url, old.title, old.content, old.description);
@@ -130,29 +200,17 @@ class SearchIndex:
         Returns the page ID.
         """
         # Extract domain from URL
-        domain = ""
-        try:
-            from urllib.parse import urlparse
-            domain = urlparse(url).netloc
-        except Exception:
-            pass
+        domain = _extract_domain(url)
         
-        word_count = len(content.split())
+        word_count = _count_words(content)
         
         try:
-            cursor = self._conn.execute("""
-                INSERT INTO indexed_pages 
-                (url, title, content, description, domain, session_id, word_count)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(url) DO UPDATE SET
-                    title = excluded.title,
-                    content = excluded.content,
-                    description = excluded.description,
-                    session_id = excluded.session_id,
-                    word_count = excluded.word_count,
-                    indexed_at = CURRENT_TIMESTAMP
-            """, (url, title, content[:50000], description[:1000], 
-                  domain, session_id, word_count))
+            cursor = self._conn.execute(UPSERT_PAGE_SQL, (
+                url, title,
+                _truncate_bytes(content, MAX_CONTENT_BYTES),
+                _truncate_bytes(description, MAX_DESCRIPTION_BYTES),
+                domain, session_id, word_count
+            ))
             self._conn.commit()
             return cursor.lastrowid
         except Exception as e:
@@ -210,20 +268,27 @@ class SearchIndex:
             """
             total = self._conn.execute(count_sql, params).fetchone()[0]
             
-            # Get paginated results with snippets
+            # Rank and paginate first, then build snippets for that page only
             search_sql = f"""
                 SELECT 
                     p.id, p.url, p.title, p.word_count, p.session_id, p.crawled_at,
-                    snippet(pages_fts, 2, '<mark>', '</mark>', '...', 40) as snippet,
-                    bm25(pages_fts) as score
-                FROM pages_fts f
-                JOIN indexed_pages p ON f.rowid = p.id
+                    snippet(pages_fts, 2, '<mark>', '</mark>', '...', 25) as snippet,
+                    t.score
+                FROM (
+                    SELECT f.rowid, bm25(pages_fts) as score
+                    FROM pages_fts f
+                    JOIN indexed_pages p ON f.rowid = p.id
+                    WHERE pages_fts MATCH ?
+                    {filter_sql}
+                    ORDER BY score
+                    LIMIT ? OFFSET ?
+                ) t
+                JOIN pages_fts ON pages_fts.rowid = t.rowid
+                JOIN indexed_pages p ON p.id = t.rowid
                 WHERE pages_fts MATCH ?
-                {filter_sql}
-                ORDER BY score
-                LIMIT ? OFFSET ?
+                ORDER BY t.score
             """
-            params.extend([per_page, offset])
+            params.extend([per_page, offset, clean_query])
             
             cursor = self._conn.execute(search_sql, params)
             rows = cursor.fetchall()
@@ -332,38 +397,91 @@ class SearchIndex:
         Index all content from a crawl session.
         Returns number of pages indexed.
         """
-        import json
-        
         content_file = data_dir / f"content_{session_id}.jsonl"
         if not content_file.exists():
             return 0
         
-        count = 0
-        with open(content_file, 'r', encoding='utf-8') as f:
+        try:
+            with self._conn:
+                cursor = self._conn.executemany(
+                    UPSERT_PAGE_SQL,
+                    self._iter_session_rows(content_file, session_id)
+                )
+            
+            # Cheap when nothing changed much; a batch of sessions should
+            # call analyze() once at the end instead
+            self._conn.execute("PRAGMA optimize")
+            return cursor.rowcount
+        except Exception as e:
+            print(f"Error indexing session {session_id}: {e}")
+            return 0
+    
+    def analyze(self) -> None:
+        """Refresh planner statistics, e.g. after indexing a batch of sessions."""
+        self._conn.executescript("""
+            ANALYZE indexed_pages;
+            PRAGMA optimize;
+        """)
+    
+    @staticmethod
+    def _iter_session_rows(content_file: Path, session_id: int):
+        """Yield indexed_pages rows from a session's JSONL content file."""
+        with open(content_file, 'rb') as f:
             for line in f:
-                if line.strip():
-                    try:
-                        record = json.loads(line)
-                        self.index_page(
-                            url=record.get('url', ''),
-                            title=record.get('title', ''),
-                            content=record.get('text', ''),
-                            description=record.get('description', ''),
-                            session_id=session_id
-                        )
-                        count += 1
-                    except json.JSONDecodeError:
-                        pass
-        
-        return count
+                if not line.strip():
+                    continue
+                try:
+                    record = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue
+                
+                url = record.get('url', '') or ''
+                text = record.get('text', '') or ''
+                description = record.get('description', '') or ''
+                
+                yield (
+                    url,
+                    record.get('title', ''),
+                    _truncate_bytes(text, MAX_CONTENT_BYTES),
+                    _truncate_bytes(description, MAX_DESCRIPTION_BYTES),
+                    _extract_domain(url),
+                    session_id,
+                    _count_words(text)
+                )
     
     def delete_session(self, session_id: int) -> int:
         """Delete all indexed pages from a session."""
-        cursor = self._conn.execute(
-            "DELETE FROM indexed_pages WHERE session_id = ?",
+        count = self._conn.execute(
+            "SELECT COUNT(*) FROM indexed_pages WHERE session_id = ?",
             (session_id,)
-        )
-        self._conn.commit()
+        ).fetchone()[0]
+        if not count:
+            return 0
+        total = self._conn.execute("SELECT COUNT(*) FROM indexed_pages").fetchone()[0]
+        
+        if count < total * BULK_DELETE_FRACTION:
+            cursor = self._conn.execute(
+                "DELETE FROM indexed_pages WHERE session_id = ?",
+                (session_id,)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+        
+        # Most of the index: skip the per-row FTS trigger and rebuild once
+        try:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DROP TRIGGER IF EXISTS pages_ad")
+            cursor = self._conn.execute(
+                "DELETE FROM indexed_pages WHERE session_id = ?",
+                (session_id,)
+            )
+            self._conn.execute("INSERT INTO pages_fts(pages_fts) VALUES('rebuild')")
+            self._conn.execute(PAGES_AD_TRIGGER_SQL)
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+        
         return cursor.rowcount
 
 
@@ -17,6 +17,10 @@ from typing import Optional
 from xml.etree import ElementTree as ET
 
 
+# <loc> entries for the malformed-XML fallback
+_LOC_RE = re.compile(r'<loc>\s*([^<]+)\s*</loc>', re.IGNORECASE)
+
+
 @dataclass
 class SitemapURL:
     """A URL entry from a sitemap."""
@@ -102,9 +106,7 @@ class SitemapParser:
         urls = []
         
         # Find all <loc>...</loc> entries
-        loc_pattern = re.compile(r'<loc>\s*([^<]+)\s*</loc>', re.IGNORECASE)
-        
-        for match in loc_pattern.finditer(content):
+        for match in _LOC_RE.finditer(content):
             url = match.group(1).strip()
             if url.startswith('http'):
                 urls.append(SitemapURL(loc=url))
@@ -119,7 +121,7 @@ class SitemapManager:
     
     def __init__(self):
         self.parser = SitemapParser()
-        self._discovered_urls: list[SitemapURL] = []
+        self._discovered_urls: dict[str, SitemapURL] = {}
         self._processed_sitemaps: set[str] = set()
     
     async def process_sitemap(
@@ -167,7 +169,9 @@ class SitemapManager:
                 )
                 urls.extend(sub_urls)
             
-            self._discovered_urls.extend(urls)
+            # Dedupe by loc while preserving discovery order
+            for url in urls:
+                self._discovered_urls.setdefault(url.loc, url)
             return urls
         
         except Exception:
@@ -209,7 +213,7 @@ class SitemapManager:
     
     def get_all_urls(self) -> list[SitemapURL]:
         """Get all discovered URLs."""
-        return self._discovered_urls.copy()
+        return list(self._discovered_urls.values())
     
     def clear(self) -> None:
         """Clear discovered URLs and processed sitemaps."""
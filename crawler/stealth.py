@@ -8,6 +8,7 @@ Features:
 - Proxy rotation support
 """
 
+import itertools
 import random
 import time
 import warnings
@@ -17,7 +18,7 @@ from typing import Optional
 warnings.filterwarnings('ignore', message='.*Error occurred during getting browser.*')
 
 # Static user agents (no network dependency)
-STATIC_USER_AGENTS = [
+STATIC_USER_AGENTS = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -25,31 +26,50 @@ STATIC_USER_AGENTS = [
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36 Edg/120.0.0.0",
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-]
+)
+
+
+def _compute_sec_ch_ua(user_agent: str) -> str:
+    """Generate Sec-Ch-Ua header based on User-Agent."""
+    if "Chrome/120" in user_agent:
+        return '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"'
+    elif "Chrome/119" in user_agent:
+        return '"Not_A Brand";v="8", "Chromium";v="119", "Google Chrome";v="119"'
+    elif "Edge" in user_agent:
+        return '"Not_A Brand";v="8", "Chromium";v="120", "Microsoft Edge";v="120"'
+    else:
+        return '"Not_A Brand";v="8", "Chromium";v="120"'
+
+
+# Sec-Ch-Ua values for the static agents, resolved once at import
+SEC_CH_UA_BY_UA = {ua: _compute_sec_ch_ua(ua) for ua in STATIC_USER_AGENTS}
 
 
 class StealthManager:
     """Manages anti-detection techniques."""
     
     # Common browser headers
-    ACCEPT_HEADERS = [
+    ACCEPT_HEADERS = (
         "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
         "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
         "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    ]
+    )
     
-    ACCEPT_LANGUAGE = [
+    ACCEPT_LANGUAGE = (
         "en-US,en;q=0.9",
         "en-GB,en;q=0.9,en-US;q=0.8",
         "en-US,en;q=0.9,es;q=0.8",
         "en,en-US;q=0.9",
-    ]
+    )
     
     ACCEPT_ENCODING = "gzip, deflate, br"
     
-    SEC_FETCH_MODES = ["navigate", "same-origin", "cors"]
-    SEC_FETCH_SITES = ["none", "same-origin", "same-site", "cross-site"]
-    SEC_FETCH_DESTS = ["document", "empty"]
+    SEC_FETCH_MODES = ("navigate", "same-origin", "cors")
+    SEC_FETCH_SITES = ("none", "same-origin", "same-site", "cross-site")
+    SEC_FETCH_DESTS = ("document", "empty")
+    
+    # Number of pre-assembled header sets to rotate through
+    HEADER_POOL_SIZE = 64
     
     def __init__(
         self,
@@ -62,6 +82,8 @@ class StealthManager:
         self.proxy_list = proxy_list or []
         self._proxy_index = 0
         self._last_user_agent: Optional[str] = None
+        self._rng = random.Random()
+        self._header_pool = self._build_header_pool()
     
     def get_user_agent(self) -> str:
         """Get a User-Agent string."""
@@ -69,11 +91,66 @@ class StealthManager:
             return self.custom_user_agent
         
         if self.rotate_agents:
-            return random.choice(STATIC_USER_AGENTS)
+            return self._rng.choice(STATIC_USER_AGENTS)
         
         # Default Chrome UA
         return STATIC_USER_AGENTS[0]
     
+    def _build_header_pool(self) -> list[tuple[str, dict[str, str]]]:
+        """
+        Pre-assemble a pool of realistic header sets.
+        
+        Each entry is a (user_agent, headers) pair without Referer, so
+        get_headers only has to pick one instead of randomizing every field.
+        """
+        if self.custom_user_agent:
+            agents = [self.custom_user_agent]
+        elif self.rotate_agents:
+            agents = STATIC_USER_AGENTS
+        else:
+            agents = [STATIC_USER_AGENTS[0]]
+        
+        combos = list(itertools.product(
+            agents,
+            self.ACCEPT_HEADERS,
+            self.ACCEPT_LANGUAGE,
+            self.SEC_FETCH_MODES,
+            self.SEC_FETCH_SITES,
+            self.SEC_FETCH_DESTS,
+        ))
+        combos = self._rng.sample(combos, min(self.HEADER_POOL_SIZE, len(combos)))
+        
+        pool = []
+        for user_agent, accept, language, mode, site, dest in combos:
+            headers = {
+                "User-Agent": user_agent,
+                "Accept": accept,
+                "Accept-Language": language,
+                "Accept-Encoding": self.ACCEPT_ENCODING,
+                "Connection": "keep-alive",
+                "Upgrade-Insecure-Requests": "1",
+            }
+            
+            # Add Sec-Fetch headers (modern browsers)
+            if "Chrome" in user_agent or "Edge" in user_agent:
+                headers.update({
+                    "Sec-Fetch-Mode": mode,
+                    "Sec-Fetch-Site": site,
+                    "Sec-Fetch-Dest": dest,
+                    "Sec-Fetch-User": "?1",
+                    "Sec-Ch-Ua": self._get_sec_ch_ua(user_agent),
+                    "Sec-Ch-Ua-Mobile": "?0",
+                    "Sec-Ch-Ua-Platform": '"Windows"',
+                })
+            
+            # Randomly add DNT header
+            if self._rng.random() < 0.3:
+                headers["DNT"] = "1"
+            
+            pool.append((user_agent, headers))
+        
+        return pool
+    
     def get_headers(self, referer: Optional[str] = None) -> dict[str, str]:
         """
         Generate randomized but realistic HTTP headers.
@@ -84,50 +161,24 @@ class StealthManager:
         Returns:
             Dictionary of HTTP headers
         """
-        user_agent = self.get_user_agent()
+        user_agent, template = self._rng.choice(self._header_pool)
         self._last_user_agent = user_agent
         
-        headers = {
-            "User-Agent": user_agent,
-            "Accept": random.choice(self.ACCEPT_HEADERS),
-            "Accept-Language": random.choice(self.ACCEPT_LANGUAGE),
-            "Accept-Encoding": self.ACCEPT_ENCODING,
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
-        }
+        headers = dict(template)
         
         # Add referer if provided
         if referer:
             headers["Referer"] = referer
         
-        # Add Sec-Fetch headers (modern browsers)
-        if "Chrome" in user_agent or "Edge" in user_agent:
-            headers.update({
-                "Sec-Fetch-Mode": random.choice(self.SEC_FETCH_MODES),
-                "Sec-Fetch-Site": random.choice(self.SEC_FETCH_SITES),
-                "Sec-Fetch-Dest": random.choice(self.SEC_FETCH_DESTS),
-                "Sec-Fetch-User": "?1",
-                "Sec-Ch-Ua": self._get_sec_ch_ua(user_agent),
-                "Sec-Ch-Ua-Mobile": "?0",
-                "Sec-Ch-Ua-Platform": '"Windows"',
-            })
-        
-        # Randomly add DNT header
-        if random.random() < 0.3:
-            headers["DNT"] = "1"
-        
         return headers
     
     def _get_sec_ch_ua(self, user_agent: str) -> str:
-        """Generate Sec-Ch-Ua header based on User-Agent."""
-        if "Chrome/120" in user_agent:
-            return '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"'
-        elif "Chrome/119" in user_agent:
-            return '"Not_A Brand";v="8", "Chromium";v="119", "Google Chrome";v="119"'
-        elif "Edge" in user_agent:
-            return '"Not_A Brand";v="8", "Chromium";v="120", "Microsoft Edge";v="120"'
-        else:
-            return '"Not_A Brand";v="8", "Chromium";v="120"'
+        """Get Sec-Ch-Ua header for a User-Agent."""
+        sec_ch_ua = SEC_CH_UA_BY_UA.get(user_agent)
+        if sec_ch_ua is None:
+            # Custom agents aren't in the precomputed table
+            sec_ch_ua = _compute_sec_ch_ua(user_agent)
+        return sec_ch_ua
     
     def get_delay(self, min_delay: float = 0.5, max_delay: float = 2.0) -> float:
         """
@@ -136,15 +187,12 @@ class StealthManager:
         Uses a distribution that favors shorter delays but occasionally
         includes longer pauses (mimicking human reading behavior).
         """
-        # Use exponential distribution for more natural timing
-        base_delay = random.expovariate(1 / ((min_delay + max_delay) / 2))
-        
-        # Clamp to range
-        delay = max(min_delay, min(max_delay, base_delay))
+        # Square a uniform sample to skew towards shorter delays
+        delay = min_delay + (max_delay - min_delay) * self._rng.random() ** 2
         
         # Occasionally add "reading time" (simulating user pausing to read)
-        if random.random() < 0.1:  # 10% chance
-            delay += random.uniform(1.0, 3.0)
+        if self._rng.random() < 0.1:  # 10% chance
+            delay += self._rng.uniform(1.0, 3.0)
         
         return delay
     
@@ -165,22 +213,22 @@ class StealthManager:
         """
         return {
             "user_agent": self.get_user_agent(),
-            "viewport": {"width": random.choice([1920, 1366, 1536, 1440]),
-                        "height": random.choice([1080, 768, 864, 900])},
-            "locale": random.choice(["en-US", "en-GB", "en"]),
-            "timezone_id": random.choice([
+            "viewport": {"width": self._rng.choice([1920, 1366, 1536, 1440]),
+                        "height": self._rng.choice([1080, 768, 864, 900])},
+            "locale": self._rng.choice(["en-US", "en-GB", "en"]),
+            "timezone_id": self._rng.choice([
                 "America/New_York",
                 "America/Los_Angeles", 
                 "Europe/London",
                 "Asia/Tokyo"
             ]),
-            "color_scheme": random.choice(["light", "dark"]),
-            "device_scale_factor": random.choice([1, 1.25, 1.5, 2]),
+            "color_scheme": self._rng.choice(["light", "dark"]),
+            "device_scale_factor": self._rng.choice([1, 1.25, 1.5, 2]),
             "is_mobile": False,
             "has_touch": False,
             "java_script_enabled": True,
             "extra_http_headers": {
-                "Accept-Language": random.choice(self.ACCEPT_LANGUAGE)
+                "Accept-Language": self._rng.choice(self.ACCEPT_LANGUAGE)
             }
         }
     
@@ -192,17 +240,17 @@ class StealthManager:
         """
         try:
             # Random scroll
-            scroll_amount = random.randint(100, 500)
+            scroll_amount = self._rng.randint(100, 500)
             await page.evaluate(f"window.scrollBy(0, {scroll_amount})")
-            await page.wait_for_timeout(random.randint(200, 500))
+            await page.wait_for_timeout(self._rng.randint(200, 500))
             
             # Random mouse movement
-            x = random.randint(100, 800)
-            y = random.randint(100, 600)
+            x = self._rng.randint(100, 800)
+            y = self._rng.randint(100, 600)
             await page.mouse.move(x, y)
             
             # Brief pause
-            await page.wait_for_timeout(random.randint(100, 300))
+            await page.wait_for_timeout(self._rng.randint(100, 300))
             
         except Exception:
             pass  # Ignore errors in human simulation
@@ -9,13 +9,82 @@ Features:
 """
 
 import asyncio
-import json
+import mmap
+import os
 import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Any
+from typing import Optional, Any, BinaryIO, Iterator
 
-import aiofiles
+import orjson
+
+
+# Hot-path statements, kept as constants so the connection's statement
+# cache always sees the same SQL text
+INSERT_DOMAIN_SQL = "INSERT OR IGNORE INTO domains (name) VALUES (?)"
+INSERT_URL_SQL = """INSERT INTO urls
+                        (session_id, domain_id, path, depth, parent_domain_id, parent_path)
+                    VALUES (?, (SELECT id FROM domains WHERE name = ?), ?, ?,
+                            (SELECT id FROM domains WHERE name = ?), ?)"""
+INSERT_URL_IGNORE_SQL = """INSERT OR IGNORE INTO urls
+                               (session_id, domain_id, path, depth, parent_domain_id, parent_path)
+                           VALUES (?, (SELECT id FROM domains WHERE name = ?), ?, ?,
+                                   (SELECT id FROM domains WHERE name = ?), ?)"""
+MARK_URL_SQL = """UPDATE urls SET status = ?, http_status = ?, content_type = ?,
+                  crawled_at = CURRENT_TIMESTAMP, error = ?
+                  WHERE session_id = ?
+                    AND domain_id = (SELECT id FROM domains WHERE name = ?)
+                    AND path = ?"""
+PENDING_URLS_SQL = """SELECT d.name || u.path AS url, u.depth,
+                             pd.name || u.parent_path AS parent_url
+                      FROM urls u
+                      JOIN domains d ON d.id = u.domain_id
+                      LEFT JOIN domains pd ON pd.id = u.parent_domain_id
+                      WHERE u.session_id = ? AND u.status = 'pending'
+                      ORDER BY u.depth ASC, u.id ASC LIMIT ?"""
+CLAIM_PENDING_SQL = """UPDATE urls SET status = 'in_progress'
+                       WHERE id IN (
+                           SELECT id FROM urls
+                           WHERE session_id = ? AND status = 'pending'
+                           ORDER BY depth ASC, id ASC LIMIT ?
+                       )
+                       RETURNING id, depth,
+                           (SELECT name FROM domains WHERE id = domain_id) || path AS url,
+                           (SELECT name FROM domains WHERE id = parent_domain_id)
+                               || parent_path AS parent_url"""
+
+# Prepared statements kept per connection (sqlite3 default is 128)
+CACHED_STATEMENTS = 256
+
+# Write buffer size for export files
+EXPORT_CHUNK_BYTES = 1 << 16
+
+# Encoded records waiting for the content writer before save_page blocks
+CONTENT_QUEUE_SIZE = 1024
+
+# (epoch second, ISO string) for the most recent timestamp formatted
+_cached_ts: tuple[int, str] = (0, "")
+
+
+def _split_url(url: Optional[str]) -> tuple[Optional[str], Optional[str]]:
+    """Split a URL into its scheme://host origin and the remainder."""
+    if url is None:
+        return None, None
+    slash = url.find('/', url.find('://') + 3)
+    if slash == -1:
+        return url, ''
+    return url[:slash], url[slash:]
+
+
+def _now_iso() -> str:
+    """Current local time as ISO 8601, formatted at most once per second."""
+    global _cached_ts
+    sec = int(time.time())
+    if sec != _cached_ts[0]:
+        _cached_ts = (sec, datetime.fromtimestamp(sec).isoformat())
+    return _cached_ts[1]
 
 
 class CrawlDatabase:
@@ -26,15 +95,38 @@ class CrawlDatabase:
     def __init__(self, db_path: Path):
         self.db_path = db_path
         self._conn: Optional[sqlite3.Connection] = None
-        self._lock = asyncio.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
     
     def connect(self) -> None:
         """Initialize database connection and schema."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="sqlite"
+            )
+        
+        # The connection is created on, and used from, the dedicated thread
+        self._executor.submit(self._connect).result()
+    
+    def _connect(self) -> None:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
-        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            cached_statements=CACHED_STATEMENTS
+        )
         self._conn.row_factory = sqlite3.Row
         
+        # WAL lets readers proceed during writes; NORMAL sync is safe under WAL
+        if str(self.db_path) != ':memory:':
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA cache_size=-65536")  # 64MB
+        self._conn.execute("PRAGMA mmap_size=268435456")  # 256MB
+        
+        self._set_aside_legacy_urls()
+        
         # Create tables
         self._conn.executescript("""
             CREATE TABLE IF NOT EXISTS crawl_sessions (
@@ -47,23 +139,49 @@ class CrawlDatabase:
                 pages_failed INTEGER DEFAULT 0
             );
             
+            -- URLs are stored as (domain_id, path); the scheme://host
+            -- prefix is shared by nearly every row of a crawl
+            CREATE TABLE IF NOT EXISTS domains (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            );
+            
             CREATE TABLE IF NOT EXISTS urls (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 session_id INTEGER,
-                url TEXT NOT NULL,
+                domain_id INTEGER NOT NULL,
+                path TEXT NOT NULL,
                 status TEXT DEFAULT 'pending',
                 http_status INTEGER,
                 content_type TEXT,
                 depth INTEGER DEFAULT 0,
-                parent_url TEXT,
+                parent_domain_id INTEGER,
+                parent_path TEXT,
                 crawled_at TIMESTAMP,
                 error TEXT,
                 FOREIGN KEY (session_id) REFERENCES crawl_sessions(id),
-                UNIQUE(session_id, url)
+                FOREIGN KEY (domain_id) REFERENCES domains(id),
+                FOREIGN KEY (parent_domain_id) REFERENCES domains(id),
+                UNIQUE(session_id, domain_id, path)
             );
             
             CREATE INDEX IF NOT EXISTS idx_urls_status ON urls(session_id, status);
-            CREATE INDEX IF NOT EXISTS idx_urls_url ON urls(url);
+            -- Serves get_pending_urls' ORDER BY without a sort step
+            CREATE INDEX IF NOT EXISTS idx_urls_pending
+                ON urls(session_id, depth, id) WHERE status = 'pending';
+            
+            -- Keep session counters in step with URL status changes
+            CREATE TRIGGER IF NOT EXISTS trg_urls_status_counts
+            AFTER UPDATE OF status ON urls
+            WHEN OLD.status IS NOT NEW.status
+            BEGIN
+                UPDATE crawl_sessions SET
+                    pages_crawled = pages_crawled
+                        + (NEW.status = 'completed') - (OLD.status = 'completed'),
+                    pages_failed = pages_failed
+                        + (NEW.status = 'failed') - (OLD.status = 'failed')
+                WHERE id = NEW.session_id;
+            END;
             
             CREATE TABLE IF NOT EXISTS domain_stats (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -78,41 +196,122 @@ class CrawlDatabase:
         """)
         
         self._conn.commit()
+        self._migrate_legacy_urls()
+        
+        # Refresh planner statistics for tables that have changed a lot
+        self._conn.execute("PRAGMA optimize")
+    
+    def _set_aside_legacy_urls(self) -> None:
+        """Rename a urls table from before the domains split to urls_legacy."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(urls)")}
+        if 'url' not in columns:
+            return
+        
+        # Indexes and triggers keep their names through a rename, so drop
+        # them first or the schema script would skip recreating them
+        self._conn.executescript("""
+            DROP TRIGGER IF EXISTS trg_urls_status_counts;
+            DROP INDEX IF EXISTS idx_urls_status;
+            DROP INDEX IF EXISTS idx_urls_url;
+            DROP INDEX IF EXISTS idx_urls_pending;
+            ALTER TABLE urls RENAME TO urls_legacy;
+        """)
+    
+    def _migrate_legacy_urls(self) -> None:
+        """Copy rows from urls_legacy into the domain/path layout."""
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'urls_legacy'"
+        ).fetchone()
+        if not exists:
+            return
+        
+        rows = []
+        domains = set()
+        for row in self._conn.execute(
+            """SELECT id, session_id, url, status, http_status, content_type,
+                      depth, parent_url, crawled_at, error FROM urls_legacy"""
+        ):
+            origin, path = _split_url(row['url'])
+            parent_origin, parent_path = _split_url(row['parent_url'])
+            domains.add(origin)
+            if parent_origin is not None:
+                domains.add(parent_origin)
+            rows.append((
+                row['id'], row['session_id'], origin, path, row['status'],
+                row['http_status'], row['content_type'], row['depth'],
+                parent_origin, parent_path, row['crawled_at'], row['error']
+            ))
+        
+        with self._conn:
+            self._conn.executemany(INSERT_DOMAIN_SQL, [(d,) for d in domains])
+            self._conn.executemany(
+                """INSERT OR IGNORE INTO urls
+                       (id, session_id, domain_id, path, status, http_status,
+                        content_type, depth, parent_domain_id, parent_path,
+                        crawled_at, error)
+                   VALUES (?, ?, (SELECT id FROM domains WHERE name = ?), ?, ?, ?,
+                           ?, ?, (SELECT id FROM domains WHERE name = ?), ?, ?, ?)""",
+                rows
+            )
+            self._conn.execute("DROP TABLE urls_legacy")
     
     def close(self) -> None:
         """Close database connection."""
+        if self._executor is None:
+            return
+        
+        self._executor.submit(self._close).result()
+        self._executor.shutdown(wait=True)
+        self._executor = None
+    
+    def _close(self) -> None:
         if self._conn:
+            self._conn.execute("PRAGMA optimize")
+            # Fold the WAL back into the main file so the next open starts clean
+            if str(self.db_path) != ':memory:':
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
             self._conn.close()
             self._conn = None
     
+    async def _run(self, func, *args):
+        """Run a blocking database call on the dedicated SQLite thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+    
     async def create_session(self, seed_url: str) -> int:
         """Create a new crawl session."""
-        async with self._lock:
-            cursor = self._conn.execute(
-                "INSERT INTO crawl_sessions (seed_url) VALUES (?)",
-                (seed_url,)
-            )
-            self._conn.commit()
-            return cursor.lastrowid
+        return await self._run(self._create_session, seed_url)
+    
+    def _create_session(self, seed_url: str) -> int:
+        cursor = self._conn.execute(
+            "INSERT INTO crawl_sessions (seed_url) VALUES (?)",
+            (seed_url,)
+        )
+        self._conn.commit()
+        return cursor.lastrowid
     
     async def get_session(self, session_id: int) -> Optional[dict]:
         """Get session details."""
-        async with self._lock:
-            cursor = self._conn.execute(
-                "SELECT * FROM crawl_sessions WHERE id = ?",
-                (session_id,)
-            )
-            row = cursor.fetchone()
-            return dict(row) if row else None
+        return await self._run(self._get_session, session_id)
+    
+    def _get_session(self, session_id: int) -> Optional[dict]:
+        cursor = self._conn.execute(
+            "SELECT * FROM crawl_sessions WHERE id = ?",
+            (session_id,)
+        )
+        row = cursor.fetchone()
+        return dict(row) if row else None
     
     async def get_latest_session(self) -> Optional[dict]:
         """Get the most recent session."""
-        async with self._lock:
-            cursor = self._conn.execute(
-                "SELECT * FROM crawl_sessions ORDER BY id DESC LIMIT 1"
-            )
-            row = cursor.fetchone()
-            return dict(row) if row else None
+        return await self._run(self._get_latest_session)
+    
+    def _get_latest_session(self) -> Optional[dict]:
+        cursor = self._conn.execute(
+            "SELECT * FROM crawl_sessions ORDER BY id DESC LIMIT 1"
+        )
+        row = cursor.fetchone()
+        return dict(row) if row else None
     
     async def update_session(
         self,
@@ -122,32 +321,54 @@ class CrawlDatabase:
         pages_failed: Optional[int] = None
     ) -> None:
         """Update session stats."""
-        async with self._lock:
-            updates = []
-            values = []
-            
-            if status:
-                updates.append("status = ?")
-                values.append(status)
-                if status == 'completed':
-                    updates.append("completed_at = ?")
-                    values.append(datetime.now().isoformat())
-            
-            if pages_crawled is not None:
-                updates.append("pages_crawled = ?")
-                values.append(pages_crawled)
-            
-            if pages_failed is not None:
-                updates.append("pages_failed = ?")
-                values.append(pages_failed)
-            
-            if updates:
-                values.append(session_id)
-                self._conn.execute(
-                    f"UPDATE crawl_sessions SET {', '.join(updates)} WHERE id = ?",
-                    values
-                )
-                self._conn.commit()
+        await self._run(
+            self._update_session, session_id, status, pages_crawled, pages_failed
+        )
+    
+    def _update_session(
+        self,
+        session_id: int,
+        status: Optional[str],
+        pages_crawled: Optional[int],
+        pages_failed: Optional[int]
+    ) -> None:
+        updates = []
+        values = []
+        
+        if status:
+            updates.append("status = ?")
+            values.append(status)
+            if status == 'completed':
+                updates.append("completed_at = CURRENT_TIMESTAMP")
+        
+        if pages_crawled is not None:
+            updates.append("pages_crawled = ?")
+            values.append(pages_crawled)
+        
+        if pages_failed is not None:
+            updates.append("pages_failed = ?")
+            values.append(pages_failed)
+        
+        if updates:
+            values.append(session_id)
+            self._conn.execute(
+                f"UPDATE crawl_sessions SET {', '.join(updates)} WHERE id = ?",
+                values
+            )
+            self._conn.commit()
+    
+    async def get_recent_sessions(self, limit: int = 20) -> list[dict]:
+        """Get the most recent crawl sessions, newest first."""
+        return await self._run(self._get_recent_sessions, limit)
+    
+    def _get_recent_sessions(self, limit: int) -> list[dict]:
+        cursor = self._conn.execute(
+            """SELECT id, seed_url, started_at, completed_at, status,
+                      pages_crawled, pages_failed
+               FROM crawl_sessions ORDER BY id DESC LIMIT ?""",
+            (limit,)
+        )
+        return [dict(row) for row in cursor.fetchall()]
     
     async def add_url(
         self,
@@ -157,17 +378,75 @@ class CrawlDatabase:
         parent_url: Optional[str] = None
     ) -> bool:
         """Add a URL to crawl. Returns True if added, False if exists."""
-        async with self._lock:
-            try:
-                self._conn.execute(
-                    """INSERT INTO urls (session_id, url, depth, parent_url)
-                       VALUES (?, ?, ?, ?)""",
-                    (session_id, url, depth, parent_url)
-                )
-                self._conn.commit()
-                return True
-            except sqlite3.IntegrityError:
-                return False
+        return await self._run(self._add_url, session_id, url, depth, parent_url)
+    
+    def _add_url(
+        self,
+        session_id: int,
+        url: str,
+        depth: int,
+        parent_url: Optional[str]
+    ) -> bool:
+        try:
+            origin, path = _split_url(url)
+            parent_origin, parent_path = _split_url(parent_url)
+            self._conn.execute(INSERT_DOMAIN_SQL, (origin,))
+            if parent_origin is not None:
+                self._conn.execute(INSERT_DOMAIN_SQL, (parent_origin,))
+            self._conn.execute(
+                INSERT_URL_SQL,
+                (session_id, origin, path, depth, parent_origin, parent_path)
+            )
+            self._conn.commit()
+            return True
+        except sqlite3.IntegrityError:
+            self._conn.rollback()
+            return False
+    
+    async def add_urls_bulk(
+        self,
+        session_id: int,
+        items: list[tuple[str, int, Optional[str]]]
+    ) -> int:
+        """
+        Add many URLs in a single transaction.
+        
+        Args:
+            session_id: Session the URLs belong to
+            items: (url, depth, parent_url) tuples
+        
+        Returns:
+            Number of URLs actually added (existing ones are skipped)
+        """
+        if not items:
+            return 0
+        
+        return await self._run(self._add_urls_bulk, session_id, items)
+    
+    def _add_urls_bulk(
+        self,
+        session_id: int,
+        items: list[tuple[str, int, Optional[str]]]
+    ) -> int:
+        rows = []
+        domains = set()
+        for url, depth, parent_url in items:
+            origin, path = _split_url(url)
+            parent_origin, parent_path = _split_url(parent_url)
+            domains.add(origin)
+            if parent_origin is not None:
+                domains.add(parent_origin)
+            rows.append((session_id, origin, path, depth, parent_origin, parent_path))
+        
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany(INSERT_DOMAIN_SQL, [(d,) for d in domains])
+            cursor = self._conn.executemany(INSERT_URL_IGNORE_SQL, rows)
+            self._conn.commit()
+            return cursor.rowcount
+        except Exception:
+            self._conn.rollback()
+            raise
     
     async def mark_url_crawled(
         self,
@@ -178,16 +457,27 @@ class CrawlDatabase:
         error: Optional[str] = None
     ) -> None:
         """Mark a URL as crawled."""
-        status = 'completed' if not error else 'failed'
+        await self._run(
+            self._mark_url_crawled, session_id, url, http_status, content_type, error
+        )
+    
+    def _mark_url_crawled(
+        self,
+        session_id: int,
+        url: str,
+        http_status: int,
+        content_type: Optional[str],
+        error: Optional[str]
+    ) -> None:
+        # Match FetchResult.success, so error-free 4xx/5xx responses count as failed
+        status = 'completed' if not error and 200 <= http_status < 400 else 'failed'
         
-        async with self._lock:
-            self._conn.execute(
-                """UPDATE urls SET status = ?, http_status = ?, content_type = ?,
-                   crawled_at = ?, error = ? WHERE session_id = ? AND url = ?""",
-                (status, http_status, content_type, datetime.now().isoformat(),
-                 error, session_id, url)
-            )
-            self._conn.commit()
+        origin, path = _split_url(url)
+        self._conn.execute(
+            MARK_URL_SQL,
+            (status, http_status, content_type, error, session_id, origin, path)
+        )
+        self._conn.commit()
     
     async def get_pending_urls(
         self,
@@ -195,29 +485,69 @@ class CrawlDatabase:
         limit: int = 100
     ) -> list[dict]:
         """Get pending URLs to crawl."""
-        async with self._lock:
-            cursor = self._conn.execute(
-                """SELECT url, depth, parent_url FROM urls
-                   WHERE session_id = ? AND status = 'pending'
-                   ORDER BY depth ASC, id ASC LIMIT ?""",
-                (session_id, limit)
-            )
-            return [dict(row) for row in cursor.fetchall()]
+        return await self._run(self._get_pending_urls, session_id, limit)
+    
+    def _get_pending_urls(self, session_id: int, limit: int) -> list[dict]:
+        cursor = self._conn.execute(PENDING_URLS_SQL, (session_id, limit))
+        return [dict(row) for row in cursor.fetchall()]
+    
+    async def claim_pending(
+        self,
+        session_id: int,
+        limit: int = 100
+    ) -> list[dict]:
+        """
+        Atomically mark up to `limit` pending URLs as in progress and return them.
+        
+        URLs come back in crawl order (shallowest first). A claimed URL is not
+        handed out again until release_claims puts it back to pending.
+        """
+        return await self._run(self._claim_pending, session_id, limit)
+    
+    def _claim_pending(self, session_id: int, limit: int) -> list[dict]:
+        cursor = self._conn.execute(CLAIM_PENDING_SQL, (session_id, limit))
+        rows = cursor.fetchall()
+        self._conn.commit()
+        
+        # RETURNING gives no ordering guarantee
+        rows.sort(key=lambda row: (row['depth'], row['id']))
+        return [
+            {'url': row['url'], 'depth': row['depth'], 'parent_url': row['parent_url']}
+            for row in rows
+        ]
+    
+    async def release_claims(self, session_id: int) -> int:
+        """Return in-progress URLs of a session to pending. Returns the count."""
+        return await self._run(self._release_claims, session_id)
+    
+    def _release_claims(self, session_id: int) -> int:
+        cursor = self._conn.execute(
+            """UPDATE urls SET status = 'pending'
+               WHERE session_id = ? AND status = 'in_progress'""",
+            (session_id,)
+        )
+        self._conn.commit()
+        return cursor.rowcount
     
     async def get_stats(self, session_id: int) -> dict:
         """Get crawl statistics."""
-        async with self._lock:
-            cursor = self._conn.execute(
-                """SELECT
-                    COUNT(*) as total,
-                    SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as completed,
-                    SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failed,
-                    SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END) as pending
-                   FROM urls WHERE session_id = ?""",
-                (session_id,)
-            )
-            row = cursor.fetchone()
-            return dict(row) if row else {}
+        return await self._run(self._get_stats, session_id)
+    
+    def _get_stats(self, session_id: int) -> dict:
+        # One row per status straight off idx_urls_status
+        cursor = self._conn.execute(
+            """SELECT status, COUNT(*) FROM urls
+               WHERE session_id = ? GROUP BY status""",
+            (session_id,)
+        )
+        counts = {row[0]: row[1] for row in cursor}
+        return {
+            'total': sum(counts.values()),
+            'completed': counts.get('completed', 0),
+            'failed': counts.get('failed', 0),
+            'pending': counts.get('pending', 0),
+            'in_progress': counts.get('in_progress', 0)
+        }
 
 
 class ContentStorage:
@@ -228,12 +558,19 @@ class ContentStorage:
     def __init__(self, output_dir: Path):
         self.output_dir = output_dir
         self._content_file: Optional[Path] = None
-        self._lock = asyncio.Lock()
+        self._fh: Optional[BinaryIO] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
     
     def initialize(self, session_id: int) -> None:
         """Initialize storage for a session."""
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self._content_file = self.output_dir / f"content_{session_id}.jsonl"
+        
+        # Keep one handle open and let a background task batch the writes
+        self._fh = open(self._content_file, 'ab', buffering=1 << 20)
+        self._queue = asyncio.Queue(maxsize=CONTENT_QUEUE_SIZE)
+        self._writer_task = asyncio.create_task(self._drain())
     
     async def save_page(
         self,
@@ -241,56 +578,161 @@ class ContentStorage:
         content: dict[str, Any]
     ) -> None:
         """Save a page's content."""
-        if not self._content_file:
+        if not self._content_file or not self._queue:
             raise RuntimeError("Storage not initialized")
         
         record = {
             'url': url,
-            'crawled_at': datetime.now().isoformat(),
+            'crawled_at': _now_iso(),
             **content
         }
         
-        async with self._lock:
-            async with aiofiles.open(self._content_file, 'a', encoding='utf-8') as f:
-                await f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        # Don't queue records for a writer that has died
+        self._raise_writer_error()
+        await self._queue.put(orjson.dumps(record) + b'\n')
+    
+    def _raise_writer_error(self) -> None:
+        """Re-raise the exception that stopped the writer task, if any."""
+        task = self._writer_task
+        if task and task.done() and not task.cancelled():
+            error = task.exception()
+            if error is not None:
+                raise error
+    
+    async def _drain(self) -> None:
+        """Write queued records to the content file, one write per batch."""
+        while True:
+            batch = [await self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            
+            self._fh.write(b''.join(batch))
+            self._fh.flush()
+    
+    async def close(self) -> None:
+        """Flush pending records and close the content file."""
+        error = None
+        if self._writer_task:
+            if self._writer_task.done():
+                error = self._writer_task.exception()
+            else:
+                self._writer_task.cancel()
+                await asyncio.gather(self._writer_task, return_exceptions=True)
+            self._writer_task = None
+        
+        if self._fh:
+            try:
+                # Write anything the writer task hadn't picked up yet
+                if error is None:
+                    pending = []
+                    while not self._queue.empty():
+                        pending.append(self._queue.get_nowait())
+                    self._fh.write(b''.join(pending))
+            finally:
+                self._fh.close()
+                self._fh = None
+        
+        if error is not None:
+            raise error
     
     async def export_to_json(self, output_path: Path) -> int:
         """Export all content to a JSON file. Returns record count."""
         if not self._content_file or not self._content_file.exists():
             return 0
         
-        records = []
-        async with aiofiles.open(self._content_file, 'r', encoding='utf-8') as f:
-            async for line in f:
-                if line.strip():
-                    records.append(json.loads(line))
-        
-        async with aiofiles.open(output_path, 'w', encoding='utf-8') as f:
-            await f.write(json.dumps(records, indent=2, ensure_ascii=False))
-        
-        return len(records)
+        return await asyncio.to_thread(_export_json, self._content_file, output_path)
     
     async def export_to_csv(self, output_path: Path, fields: list[str]) -> int:
         """Export specified fields to CSV. Returns record count."""
         if not self._content_file or not self._content_file.exists():
             return 0
         
-        import csv
-        
-        records = []
-        async with aiofiles.open(self._content_file, 'r', encoding='utf-8') as f:
-            async for line in f:
-                if line.strip():
-                    records.append(json.loads(line))
-        
-        # Write CSV synchronously (csv module doesn't support async)
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
-            writer.writeheader()
-            for record in records:
-                writer.writerow(record)
-        
-        return len(records)
+        return await asyncio.to_thread(
+            _export_csv, self._content_file, output_path, fields
+        )
+
+
+def content_line_span(f: BinaryIO, start: int, limit: int) -> tuple[int, int]:
+    """
+    Byte range of up to `limit` complete lines of an open content file.
+    
+    The range begins at the first line starting at or after `start`, and
+    a final line without its newline (a write in progress) is left out.
+    """
+    size = os.fstat(f.fileno()).st_size
+    # mmap cannot map an empty file
+    if start >= size:
+        return size, size
+    # Finding newlines in the mapping is much cheaper than Python's
+    # buffered line iteration when records are large
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if start > 0 and mm[start - 1] != 0x0A:
+            nl = mm.find(b'\n', start)
+            start = size if nl < 0 else nl + 1
+        pos = start
+        for _ in range(limit):
+            nl = mm.find(b'\n', pos)
+            if nl < 0:
+                break
+            pos = nl + 1
+        return start, pos
+
+
+def iter_content_records(f: BinaryIO, start: int, end: int) -> Iterator[dict]:
+    """Yield the records on the lines between two byte offsets of an open content file."""
+    if start >= end:
+        return
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = start
+        while pos < end:
+            nl = mm.find(b'\n', pos, end)
+            if nl < 0:
+                nl = end
+            line = mm[pos:nl]
+            pos = nl + 1
+            # Blank lines fail to parse and are skipped
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
+            yield record
+
+
+def _export_json(content_file: Path, output_path: Path) -> int:
+    """Copy JSONL records into a JSON array file. Returns record count."""
+    # Each JSONL line is already a serialized record, so copy them into
+    # the array as they are read instead of loading everything first
+    count = 0
+    with open(content_file, 'rb') as src, \
+            open(output_path, 'wb', buffering=EXPORT_CHUNK_BYTES) as dst:
+        dst.write(b'[')
+        for line in src:
+            line = line.strip()
+            if not line:
+                continue
+            dst.write(b',\n' if count else b'\n')
+            dst.write(line)
+            count += 1
+        dst.write(b'\n]\n')
+    
+    return count
+
+
+def _export_csv(content_file: Path, output_path: Path, fields: list[str]) -> int:
+    """Write the given fields of each JSONL record to CSV. Returns record count."""
+    import csv
+    
+    count = 0
+    with open(content_file, 'rb') as src, \
+            open(output_path, 'w', newline='', encoding='utf-8') as dst:
+        writer = csv.DictWriter(dst, fieldnames=fields, extrasaction='ignore')
+        writer.writeheader()
+        for line in src:
+            if line.strip():
+                writer.writerow(orjson.loads(line))
+                count += 1
+    
+    return count
 
 
 class StorageManager:
@@ -317,6 +759,8 @@ class StorageManager:
         
         if session and session['status'] == 'running':
             self._session_id = session['id']
+            # URLs claimed by the interrupted run were never finished
+            await self.db.release_claims(self._session_id)
             self.content.initialize(self._session_id)
             return self._session_id
         
@@ -332,4 +776,7 @@ class StorageManager:
         """Close storage connections."""
         if self._session_id:
             await self.db.update_session(self._session_id, status='completed')
-        self.db.close()
+        try:
+            await self.content.close()
+        finally:
+            self.db.close()
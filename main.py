@@ -15,10 +15,6 @@ from typing import Optional
 
 import typer
 from rich.console import Console
-from rich.table import Table
-
-from crawler.config import CrawlerConfig
-from crawler.crawler import Crawler
 
 app = typer.Typer(
     name="sota-crawler",
@@ -29,6 +25,15 @@ app = typer.Typer(
 console = Console()
 
 
+def run_async(coro):
+    """Run a coroutine to completion, on uvloop when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    return uvloop.run(coro)
+
+
 @app.command()
 def crawl(
     url: str = typer.Argument(..., help="Starting URL to crawl"),
@@ -52,6 +57,9 @@ def crawl(
         python main.py crawl https://spa-site.com --render --max-pages 50
         python main.py crawl https://example.com -n 1000 -c 10 -o ./output
     """
+    from crawler.config import CrawlerConfig
+    from crawler.crawler import Crawler
+    
     # Validate URL
     if not url.startswith(('http://', 'https://')):
         url = 'https://' + url
@@ -87,7 +95,7 @@ def crawl(
     crawler = Crawler(config)
     
     try:
-        asyncio.run(crawler.crawl(url))
+        run_async(crawler.crawl(url))
     except KeyboardInterrupt:
         console.print("\n[yellow]Crawl interrupted by user[/yellow]")
 
@@ -99,6 +107,9 @@ def resume(
     """
     Resume the last interrupted crawl session.
     """
+    from crawler.config import CrawlerConfig
+    from crawler.crawler import Crawler
+    
     config = CrawlerConfig(output_dir=output)
     config.db_path = config.output_dir / "crawler.db"
     
@@ -109,7 +120,7 @@ def resume(
     crawler = Crawler(config)
     
     try:
-        asyncio.run(crawler.crawl("", resume=True))
+        run_async(crawler.crawl("", resume=True))
     except KeyboardInterrupt:
         console.print("\n[yellow]Crawl interrupted by user[/yellow]")
 
@@ -142,10 +153,10 @@ def export(
         dest = output / f"export_{session_id}.{format}"
     
     if format == "json":
-        count = asyncio.run(storage.export_to_json(dest))
+        count = run_async(storage.export_to_json(dest))
     elif format == "csv":
         fields = ['url', 'title', 'description', 'crawled_at']
-        count = asyncio.run(storage.export_to_csv(dest, fields))
+        count = run_async(storage.export_to_csv(dest, fields))
     else:
         console.print(f"[red]Unknown format: {format}[/red]")
         raise typer.Exit(1)
@@ -160,37 +171,32 @@ def stats(
     """
     Show statistics from the last crawl.
     """
-    import sqlite3
+    from rich.table import Table
+    
+    from crawler.storage import CrawlDatabase
     
     db_path = output / "crawler.db"
     if not db_path.exists():
         console.print("[red]No crawl database found[/red]")
         raise typer.Exit(1)
     
-    conn = sqlite3.connect(str(db_path))
-    conn.row_factory = sqlite3.Row
+    async def load_stats():
+        db = CrawlDatabase(db_path)
+        db.connect()
+        try:
+            session = await db.get_latest_session()
+            if not session:
+                return None, None
+            return session, await db.get_stats(session['id'])
+        finally:
+            db.close()
     
-    # Get latest session
-    cursor = conn.execute(
-        "SELECT * FROM crawl_sessions ORDER BY id DESC LIMIT 1"
-    )
-    session = cursor.fetchone()
+    session, url_stats = run_async(load_stats())
     
     if not session:
         console.print("[red]No crawl sessions found[/red]")
         raise typer.Exit(1)
     
-    # Get URL stats
-    cursor = conn.execute("""
-        SELECT
-            COUNT(*) as total,
-            SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as completed,
-            SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failed,
-            SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END) as pending
-        FROM urls WHERE session_id = ?
-    """, (session['id'],))
-    url_stats = cursor.fetchone()
-    
     # Display
     table = Table(title=f"Crawl Session #{session['id']}")
     table.add_column("Metric", style="cyan")
@@ -207,8 +213,6 @@ def stats(
     table.add_row("Pending", str(url_stats['pending']))
     
     console.print(table)
-    
-    conn.close()
 
 
 @app.command()
@@ -0,0 +1,58 @@
+"""
+Tests for the crawler orchestrator.
+"""
+
+import pytest
+
+from crawler.config import CrawlerConfig
+from crawler.crawler import Crawler, claim_seed, get_parse_pool, release_seed, shutdown_parse_pool
+from crawler.storage import StorageManager
+
+
+class TestSeedClaims:
+    """Tests for the one-crawl-per-seed guard."""
+    
+    def test_seed_claimed_once_until_released(self):
+        """Test that a seed can't be claimed twice, in any spelling, until released."""
+        assert claim_seed("https://Example.com/start/")
+        try:
+            assert not claim_seed("https://example.com/start")
+        finally:
+            release_seed("https://example.com/start#top")
+        
+        assert claim_seed("https://example.com/start")
+        release_seed("https://example.com/start")
+
+
+class TestParsePool:
+    """Tests for parsing pages in the shared process pool."""
+    
+    @pytest.fixture
+    def pool(self):
+        yield get_parse_pool(1)
+        shutdown_parse_pool()
+    
+    def test_pool_is_shared(self, pool):
+        """Test that later callers get the pool already started."""
+        assert get_parse_pool() is pool
+    
+    @pytest.mark.asyncio
+    async def test_process_page_in_pool(self, pool, tmp_path):
+        """Test that a page parsed in a pool process is returned and its links queued."""
+        crawler = Crawler(CrawlerConfig(output_dir=tmp_path, db_path=tmp_path / "crawler.db"))
+        crawler._parse_pool = pool
+        crawler.storage = StorageManager(crawler.config.db_path, crawler.config.output_dir)
+        await crawler.storage.start_session("https://example.com/")
+        
+        html = (
+            "<html><head><title>Home</title></head>"
+            '<body><h1>Welcome</h1><a href="/about">About</a></body></html>'
+        )
+        try:
+            parsed = await crawler._process_page("https://example.com/", html, depth=0)
+        finally:
+            await crawler.storage.close()
+        
+        assert parsed.metadata.title == "Home"
+        assert parsed.headings['h1'] == ["Welcome"]
+        assert crawler.frontier.size == 1
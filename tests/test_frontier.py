@@ -14,65 +14,35 @@ from crawler.frontier import (
 class TestNormalizeURL:
     """Tests for URL normalization."""
     
-    def test_basic_normalization(self):
-        """Test basic URL normalization."""
-        url = normalize_url("https://Example.COM/path")
-        assert url == "https://example.com/path"
-    
-    def test_removes_fragment(self):
-        """Test fragment removal."""
-        url = normalize_url("https://example.com/page#section")
-        assert url == "https://example.com/page"
-    
-    def test_removes_trailing_slash(self):
-        """Test trailing slash removal."""
-        url = normalize_url("https://example.com/path/")
-        assert url == "https://example.com/path"
-    
-    def test_keeps_root_slash(self):
-        """Test root path keeps slash."""
-        url = normalize_url("https://example.com/")
-        assert url == "https://example.com/"
-    
-    def test_resolves_relative(self):
-        """Test relative URL resolution."""
-        url = normalize_url("/page", "https://example.com/base")
-        assert url == "https://example.com/page"
-    
-    def test_removes_default_port(self):
-        """Test default port removal."""
-        url = normalize_url("https://example.com:443/path")
-        assert url == "https://example.com/path"
-        
-        url = normalize_url("http://example.com:80/path")
-        assert url == "http://example.com/path"
-    
-    def test_sorts_query_params(self):
-        """Test query parameter sorting."""
-        url = normalize_url("https://example.com/page?z=1&a=2")
-        assert url == "https://example.com/page?a=2&z=1"
-    
-    def test_rejects_non_http(self):
-        """Test rejection of non-HTTP URLs."""
-        assert normalize_url("ftp://example.com") is None
-        assert normalize_url("javascript:void(0)") is None
-        assert normalize_url("mailto:test@example.com") is None
+    @pytest.mark.parametrize("raw,base,expected", [
+        pytest.param("https://Example.COM/path", None, "https://example.com/path", id="basic"),
+        pytest.param("https://example.com/page#section", None, "https://example.com/page", id="removes-fragment"),
+        pytest.param("https://example.com/path/", None, "https://example.com/path", id="removes-trailing-slash"),
+        pytest.param("https://example.com/", None, "https://example.com/", id="keeps-root-slash"),
+        pytest.param("/page", "https://example.com/base", "https://example.com/page", id="resolves-relative"),
+        pytest.param("https://example.com:443/path", None, "https://example.com/path", id="removes-https-port"),
+        pytest.param("http://example.com:80/path", None, "http://example.com/path", id="removes-http-port"),
+        pytest.param("https://example.com/page?z=1&a=2", None, "https://example.com/page?a=2&z=1", id="sorts-query"),
+        pytest.param("ftp://example.com", None, None, id="rejects-ftp"),
+        pytest.param("javascript:void(0)", None, None, id="rejects-javascript"),
+        pytest.param("mailto:test@example.com", None, None, id="rejects-mailto"),
+    ])
+    def test_normalize(self, raw, base, expected):
+        """Test URL normalization cases."""
+        assert normalize_url(raw, base) == expected
 
 
 class TestGetDomain:
     """Tests for domain extraction."""
     
-    def test_basic_domain(self):
-        """Test basic domain extraction."""
-        assert get_domain("https://example.com/path") == "example.com"
-    
-    def test_subdomain(self):
-        """Test subdomain handling."""
-        assert get_domain("https://www.example.com/path") == "www.example.com"
-    
-    def test_port(self):
-        """Test domain with port."""
-        assert get_domain("https://example.com:8080/path") == "example.com:8080"
+    @pytest.mark.parametrize("url,expected", [
+        pytest.param("https://example.com/path", "example.com", id="basic"),
+        pytest.param("https://www.example.com/path", "www.example.com", id="subdomain"),
+        pytest.param("https://example.com:8080/path", "example.com:8080", id="port"),
+    ])
+    def test_get_domain(self, url, expected):
+        """Test domain extraction cases."""
+        assert get_domain(url) == expected
 
 
 class TestBloomFilter:
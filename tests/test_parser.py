@@ -125,6 +125,16 @@ class TestHTMLParser:
         assert "paragraph text" in parsed.text_content
         assert "var x" not in parsed.text_content  # Script should be removed
     
+    def test_extract_text_spaces_removed_elements(self, parser):
+        """Test that text around removed comments and tags stays word-separated."""
+        html = (
+            "<html><body><p>text<!-- c -->more<style>p {}</style>tail"
+            "<noscript>n</noscript>end</p></body></html>"
+        )
+        parsed = parser.parse(html)
+        
+        assert parsed.text_content == "text more tail end"
+    
     def test_extract_headings(self, parser):
         """Test heading extraction."""
         html = '''
@@ -194,3 +204,52 @@ class TestHTMLParser:
         
         links = parser.get_crawlable_links(parsed)
         assert len(links) == 0
+    
+    def test_stream_parse_matches_tree(self, parser, monkeypatch):
+        """Test the incremental path for large pages gives the same result."""
+        html = '''
+        <html lang="en">
+        <head>
+            <title>Big <b>Page</b></title>
+            <meta name="description" content="Test description">
+            <link rel="canonical" href="https://example.com/canonical">
+            <script type="application/ld+json">{"@type": "Article"}</script>
+        </head>
+        <body>
+            <nav><a href="/nav">Nav</a></nav>
+            <h1>Main <span>Heading</span></h1>
+            <p>Intro<!-- note -->text <a href="/page1" rel="nofollow">Page <em>1</em></a></p>
+            <script>var skipped = true;</script>after script
+            <iframe src="/frame"></iframe>
+            <img src="/image.png" alt="Image">
+            <h2></h2>
+        </body>
+        </html>
+        '''
+        tree_parsed = parser.parse(html)
+        
+        monkeypatch.setattr("crawler.parser.STREAM_PARSE_THRESHOLD", 0)
+        stream_parsed = parser.parse(html)
+        
+        # Checked directly too, so a regression shared by both paths is caught
+        assert stream_parsed.text_content == (
+            "Big <b>Page</b> Main Heading Intro text Page 1 after script"
+        )
+        assert stream_parsed == tree_parsed
+    
+    def test_script_and_style_text_skipped_in_headings_and_links(self, parser, monkeypatch):
+        """Test that script/style text stays out of headings and link text on both paths."""
+        html = (
+            "<html><body><h1>Hello<style>.x{color:red}</style></h1>"
+            '<a href="/x">Go<script>track()</script><!-- c -->now</a>'
+            "<h2>Tem<template><b>hidden</b></template>plate</h2></body></html>"
+        )
+        
+        for threshold in (1 << 20, 0):
+            monkeypatch.setattr("crawler.parser.STREAM_PARSE_THRESHOLD", threshold)
+            parsed = parser.parse(html)
+            
+            # Same as bs4's get_text(strip=True)
+            assert parsed.headings['h1'] == ["Hello"]
+            assert parsed.headings['h2'] == ["Template"]
+            assert parsed.links[0].text == "Gonow"
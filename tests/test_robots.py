@@ -84,6 +84,20 @@ Disallow: /exact$
         assert parser.is_allowed(rules, "/exact") is False
         assert parser.is_allowed(rules, "/exact/more") is True
     
+    def test_full_url(self, parser):
+        """Test full URLs are matched on their path and query."""
+        content = """
+User-agent: *
+Disallow: /private
+Disallow: /*?session=
+"""
+        rules = parser.parse(content, "https://example.com/")
+        
+        assert parser.is_allowed(rules, "https://example.com/public#private") is True
+        assert parser.is_allowed(rules, "https://example.com/private/page") is False
+        assert parser.is_allowed(rules, "https://example.com/cart?session=1") is False
+        assert parser.is_allowed(rules, "https://example.com") is True
+    
     def test_empty_disallow(self, parser):
         """Test empty disallow (allow all)."""
         content = """
@@ -114,6 +128,20 @@ Disallow: /private
         rules = parser_generic.parse(content, "https://example.com/")
         
         assert parser_generic.is_allowed(rules, "/private") is False
+    
+    def test_shared_content_per_host_sitemaps(self, parser):
+        """Test identical files on two hosts resolve sitemaps per host."""
+        content = """
+User-agent: *
+Disallow: /private
+Sitemap: /sitemap.xml
+"""
+        first = parser.parse(content, "https://a.example.com/")
+        second = parser.parse(content, "https://b.example.com/")
+        
+        assert first.sitemaps == ["https://a.example.com/sitemap.xml"]
+        assert second.sitemaps == ["https://b.example.com/sitemap.xml"]
+        assert parser.is_allowed(second, "/private") is False
 
 
 class TestRobotsRules:
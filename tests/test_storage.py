@@ -0,0 +1,107 @@
+"""
+Tests for crawl state storage.
+"""
+
+import asyncio
+
+import pytest
+
+from crawler.storage import ContentStorage, CrawlDatabase, StorageManager
+
+
+class TestCrawlDatabase:
+    """Tests for the crawl state database."""
+    
+    @pytest.fixture
+    def db(self, tmp_path):
+        db = CrawlDatabase(tmp_path / "crawler.db")
+        db.connect()
+        yield db
+        db.close()
+    
+    @pytest.mark.asyncio
+    async def test_session_counters_follow_url_status(self, db):
+        """Test that marking URLs keeps the session counters in step."""
+        session_id = await db.create_session("https://example.com/")
+        for path in ("/", "/missing", "/broken"):
+            await db.add_url(session_id, f"https://example.com{path}")
+        
+        await db.mark_url_crawled(session_id, "https://example.com/", 200, "text/html")
+        # An error-free 404 is still a failed fetch
+        await db.mark_url_crawled(session_id, "https://example.com/missing", 404)
+        await db.mark_url_crawled(session_id, "https://example.com/broken", 0, error="timeout")
+        
+        session = (await db.get_recent_sessions(1))[0]
+        assert session["pages_crawled"] == 1
+        assert session["pages_failed"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_update_session_sets_final_counters(self, db):
+        """Test that final counters passed to update_session are stored."""
+        session_id = await db.create_session("https://example.com/")
+        await db.update_session(session_id, status="completed", pages_crawled=6, pages_failed=5)
+        
+        session = (await db.get_recent_sessions(1))[0]
+        assert session["status"] == "completed"
+        assert (session["pages_crawled"], session["pages_failed"]) == (6, 5)
+    
+    @pytest.mark.asyncio
+    async def test_resumed_session_counters_are_cumulative(self, tmp_path):
+        """Test that a resumed crawl's totals include pages from before the interrupt."""
+        urls = [f"https://example.com/{i}" for i in range(4)]
+        
+        # First run: crawl two URLs, then die without completing the session
+        storage = StorageManager(tmp_path / "crawler.db", tmp_path / "output")
+        session_id = await storage.start_session(urls[0])
+        for url in urls:
+            await storage.db.add_url(session_id, url)
+        claimed = await storage.db.claim_pending(session_id, limit=2)
+        await storage.db.mark_url_crawled(session_id, claimed[0]['url'], 200, "text/html")
+        await storage.db.mark_url_crawled(session_id, claimed[1]['url'], 404)
+        await storage.content.close()
+        storage.db.close()
+        
+        # Second run: resume and finish the rest the way the crawler does
+        storage = StorageManager(tmp_path / "crawler.db", tmp_path / "output")
+        assert await storage.resume_session() == session_id
+        for pending in await storage.db.claim_pending(session_id):
+            await storage.db.mark_url_crawled(session_id, pending['url'], 200, "text/html")
+        await storage.db.update_session(session_id, status="completed")
+        
+        session = (await storage.db.get_recent_sessions(1))[0]
+        await storage.close()
+        
+        assert session["status"] == "completed"
+        assert (session["pages_crawled"], session["pages_failed"]) == (3, 1)
+
+
+class TestContentStorage:
+    """Tests for the JSON Lines content writer."""
+    
+    @pytest.mark.asyncio
+    async def test_records_written_on_close(self, tmp_path):
+        """Test that saved pages are all in the content file after close."""
+        storage = ContentStorage(tmp_path)
+        storage.initialize(1)
+        for i in range(3):
+            await storage.save_page(f"https://example.com/{i}", {"title": str(i)})
+        await storage.close()
+        
+        lines = (tmp_path / "content_1.jsonl").read_bytes().splitlines()
+        assert len(lines) == 3
+    
+    @pytest.mark.asyncio
+    async def test_writer_failure_is_raised(self, tmp_path):
+        """Test that a failed write surfaces from save_page and close."""
+        storage = ContentStorage(tmp_path)
+        storage.initialize(1)
+        storage._fh.close()  # Every write now fails
+        
+        await storage.save_page("https://example.com/", {"title": "Home"})
+        while not storage._writer_task.done():
+            await asyncio.sleep(0)
+        
+        with pytest.raises(ValueError):
+            await storage.save_page("https://example.com/next", {"title": "Next"})
+        with pytest.raises(ValueError):
+            await storage.close()
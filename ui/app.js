@@ -102,6 +102,9 @@ class CrawlerApp {
 
         try {
             this.ws = new WebSocket(wsUrl);
+            // Updates arrive as UTF-8 JSON in binary frames
+            this.ws.binaryType = 'arraybuffer';
+            const decoder = new TextDecoder();
 
             this.ws.onopen = () => {
                 this.updateConnectionStatus('connected');
@@ -117,7 +120,8 @@ class CrawlerApp {
             };
 
             this.ws.onmessage = (event) => {
-                const data = JSON.parse(event.data);
+                const text = typeof event.data === 'string' ? event.data : decoder.decode(event.data);
+                const data = JSON.parse(text);
                 this.handleWebSocketMessage(data);
             };
         } catch (error) {
@@ -271,8 +275,11 @@ class CrawlerApp {
     async viewData(sessionId) {
         try {
             const response = await fetch(`/api/data/${sessionId}?limit=50`);
-            const data = await response.json();
-            this.showDataModal(data.records);
+            // Records arrive as newline-delimited JSON
+            const records = response.ok
+                ? (await response.text()).split('\n').filter(Boolean).map(line => JSON.parse(line))
+                : [];
+            this.showDataModal(records);
         } catch (error) {
             alert('Failed to load crawl data');
         }
@@ -413,7 +420,12 @@ class CrawlerApp {
 
     async runScheduleNow(id) {
         try {
-            await fetch(`/api/schedules/${id}/run-now`, { method: 'POST' });
+            const response = await fetch(`/api/schedules/${id}/run-now`, { method: 'POST' });
+            if (!response.ok) {
+                const result = await response.json();
+                alert('Failed to trigger: ' + (result.detail || 'Unknown error'));
+                return;
+            }
             alert('Schedule triggered!');
             this.loadSchedules();
         } catch (error) { alert('Failed to trigger'); }
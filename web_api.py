@@ -10,67 +10,121 @@ Provides:
 """
 
 import asyncio
-import json
+import base64
+import itertools
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, BinaryIO, Iterator, Optional
 
+import orjson
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 
 from crawler.config import CrawlerConfig
-from crawler.crawler import Crawler
-from crawler.storage import CrawlDatabase, ContentStorage
+from crawler.crawler import Crawler, claim_seed, release_seed, shutdown_parse_pool
+from crawler.frontier import normalize_url
+from crawler.storage import CrawlDatabase, ContentStorage, content_line_span, iter_content_records
 from crawler.scheduler import (
     CrawlScheduler, ScheduleConfig, ScheduleType, ScheduleStatus, get_scheduler
 )
 from crawler.changes import ChangeDatabase, ChangeDetector, get_change_db
-from crawler.classifier import classify_content, get_classifier
+from crawler.classifier import classify_content, classify_content_file
 from crawler.search import SearchIndex, get_search_index
 
 
+class OrjsonResponse(JSONResponse):
+    """JSON response rendered with orjson (FastAPI's own ORJSONResponse is deprecated)."""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
 app = FastAPI(
     title="SOTA Web Crawler",
     description="State-of-the-art web crawling system with real-time monitoring",
-    version="1.3.0"
+    version="1.3.0",
+    default_response_class=OrjsonResponse
 )
 
 # Global instances
 scheduler: Optional[CrawlScheduler] = None
 change_db: Optional[ChangeDatabase] = None
+change_detector: Optional[ChangeDetector] = None
 search_index: Optional[SearchIndex] = None
+history_db: Optional[CrawlDatabase] = None
+# Worker processes for CPU-bound diffing and classification
+cpu_pool: Optional[ProcessPoolExecutor] = None
+# Schedule ids waiting for a "run now" crawl, and the tasks that run them
+run_now_queue: Optional[asyncio.Queue] = None
+run_now_workers: list[asyncio.Task] = []
+
+# Pending "run now" requests beyond this are rejected with 429
+RUN_NOW_QUEUE_SIZE = 16
+# "Run now" crawls that may execute at the same time
+RUN_NOW_WORKERS = 2
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize all services on startup."""
-    global scheduler, change_db, search_index
+    global scheduler, change_db, change_detector, search_index, history_db, cpu_pool
+    global run_now_queue
+    
     scheduler = get_scheduler(
         db_path=Path("./data/scheduler.db"),
         output_dir=Path("./data")
     )
     await scheduler.start()
     
+    run_now_queue = asyncio.Queue(maxsize=RUN_NOW_QUEUE_SIZE)
+    run_now_workers[:] = [
+        asyncio.create_task(_run_now_worker()) for _ in range(RUN_NOW_WORKERS)
+    ]
+    
     change_db = get_change_db(Path("./data/changes.db"))
+    change_detector = ChangeDetector(change_db)
     search_index = get_search_index(Path("./data/search.db"))
+    
+    # One long-lived connection serves /api/history; connecting creates the
+    # file and schema if no crawl has run yet
+    history_db = CrawlDatabase(Path("./data/crawler.db"))
+    await asyncio.to_thread(history_db.connect)
+    
+    # Spawn rather than fork: the loop and the database threads are running
+    cpu_pool = ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        mp_context=multiprocessing.get_context('spawn')
+    )
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
-    global scheduler, change_db, search_index
+    global scheduler, change_db, search_index, history_db, cpu_pool
+    for worker in run_now_workers:
+        worker.cancel()
     if scheduler:
         await scheduler.stop()
     if change_db:
         change_db.close()
     if search_index:
         search_index.close()
+    if history_db:
+        await asyncio.to_thread(history_db.close)
+    if cpu_pool:
+        cpu_pool.shutdown(wait=False, cancel_futures=True)
+    shutdown_parse_pool()
 
 # Global state
 active_crawlers: dict[str, dict] = {}
-websocket_connections: list[WebSocket] = []
+# Source of crawl ids; unique for the life of the process
+_CRAWL_SEQ = itertools.count(1)
 
 
 class CrawlRequest(BaseModel):
@@ -91,43 +145,101 @@ class CrawlResponse(BaseModel):
     message: str
 
 
+# Messages buffered per WebSocket client before it is considered too slow
+CLIENT_QUEUE_SIZE = 32
+
+
 # WebSocket connection manager
 class ConnectionManager:
+    """
+    Tracks WebSocket clients, each with its own bounded send queue.
+    
+    A sender task per client drains its queue, so broadcast() never waits
+    on the network. Clients that fall CLIENT_QUEUE_SIZE messages behind
+    are closed.
+    """
+    
     def __init__(self):
-        self.active_connections: list[WebSocket] = []
+        self.active_connections: dict[WebSocket, asyncio.Queue] = {}
+        self._senders: dict[WebSocket, asyncio.Task] = {}
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        self.active_connections[websocket] = queue
+        self._senders[websocket] = asyncio.create_task(self._send_loop(websocket, queue))
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        self.active_connections.pop(websocket, None)
+        sender = self._senders.pop(websocket, None)
+        if sender and sender is not asyncio.current_task():
+            sender.cancel()
+
+    def _evict(self, websocket: WebSocket):
+        """Drop a client that cannot keep up and close its socket."""
+        self.disconnect(websocket)
+        asyncio.create_task(self._close(websocket))
+
+    @staticmethod
+    async def _close(websocket: WebSocket):
+        try:
+            await websocket.close(code=1013)  # Try again later
+        except Exception:
+            pass
 
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception:
-                pass
+    async def _send_loop(self, websocket: WebSocket, queue: asyncio.Queue):
+        try:
+            while True:
+                payload = await queue.get()
+                await websocket.send_bytes(payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self._evict(websocket)
+
+    def _enqueue(self, websocket: WebSocket, queue: asyncio.Queue, payload: bytes):
+        try:
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self._evict(websocket)
+
+    def send(self, websocket: WebSocket, message: dict):
+        """Queue a message for one client."""
+        queue = self.active_connections.get(websocket)
+        if queue is not None:
+            self._enqueue(websocket, queue, orjson.dumps(message))
+
+    async def broadcast(self, message: dict | bytes):
+        if not self.active_connections:
+            return
+        # Encode once for all clients and send the same bytes as a binary
+        # frame; text frames would be re-encoded for every socket
+        payload = message if isinstance(message, bytes) else orjson.dumps(message)
+        for websocket, queue in list(self.active_connections.items()):
+            self._enqueue(websocket, queue, payload)
 
 
 manager = ConnectionManager()
 
 
+# The UI ships with the package, so it is checked and stat'ed once at import
+UI_INDEX = Path(__file__).parent / "ui" / "index.html"
+HAS_UI = UI_INDEX.exists()
+UI_STAT = UI_INDEX.stat() if HAS_UI else None
+
+
 @app.get("/", response_class=HTMLResponse)
 async def root():
     """Serve the main UI."""
-    ui_path = Path(__file__).parent / "ui" / "index.html"
-    if ui_path.exists():
-        return FileResponse(ui_path)
+    if HAS_UI:
+        return FileResponse(UI_INDEX, stat_result=UI_STAT)
     return HTMLResponse("<h1>SOTA Crawler API</h1><p>UI not found. Use API endpoints.</p>")
 
 
 @app.post("/api/crawl", response_model=CrawlResponse)
 async def start_crawl(request: CrawlRequest):
     """Start a new crawl job."""
-    crawl_id = f"crawl_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    crawl_id = "crawl_" + base64.b32encode(next(_CRAWL_SEQ).to_bytes(5, "big")).decode()
     
     # Create config
     config = CrawlerConfig(
@@ -184,7 +296,12 @@ async def start_crawl(request: CrawlRequest):
                 "crawl_id": crawl_id,
                 "error": str(e)
             })
+        finally:
+            release_seed(request.url)
     
+    # Reject a second crawl of the same seed while the first is running
+    if not claim_seed(request.url):
+        raise HTTPException(status_code=409, detail="A crawl for this URL is already running")
     asyncio.create_task(run_crawl())
     
     return CrawlResponse(
@@ -194,6 +311,23 @@ async def start_crawl(request: CrawlRequest):
     )
 
 
+# Keys of the "stats" object in progress messages, in snapshot order
+PROGRESS_FIELDS = (
+    "pages_crawled", "pages_failed", "pages_skipped",
+    "queue_size", "in_progress", "urls_seen"
+)
+
+
+def _progress_snapshot(crawler: Crawler) -> tuple:
+    """Current progress counters as a tuple ordered like PROGRESS_FIELDS."""
+    stats = crawler.stats
+    frontier = crawler.frontier
+    return (
+        stats.pages_crawled, stats.pages_failed, stats.pages_skipped,
+        frontier.size, frontier.in_progress_count, frontier.seen_count
+    )
+
+
 async def crawl_with_updates(crawler: Crawler, url: str, crawl_id: str):
     """Run crawl and send progress updates via WebSocket."""
     # Initialize components
@@ -203,7 +337,7 @@ async def crawl_with_updates(crawler: Crawler, url: str, crawl_id: str):
         # Start session
         session_id = await crawler.storage.start_session(url)
         await crawler.frontier.add(url, depth=0)
-        await crawler.storage.db.add_url(session_id, url, depth=0)
+        await crawler.storage.db.add_url(session_id, normalize_url(url) or url, depth=0)
         
         crawler._running = True
         
@@ -213,32 +347,46 @@ async def crawl_with_updates(crawler: Crawler, url: str, crawl_id: str):
             for i in range(crawler.config.concurrent_requests)
         ]
         
-        # Send progress updates
+        # Send progress updates; only the stats change between frames, so
+        # the rest of the message is encoded once up front
+        progress_head = orjson.dumps({"type": "progress", "crawl_id": crawl_id})[:-1] + b',"stats":'
+        last_snapshot = None
+        pending = set(workers)
+        progress = None
         while crawler._running:
-            if all(w.done() for w in workers):
+            if progress is None:
+                progress = asyncio.create_task(crawler.progress_event.wait())
+            
+            # Wakes as soon as a URL finishes or a worker exits; the timeout
+            # still catches queue growth between completions
+            done, _ = await asyncio.wait(
+                pending | {progress}, timeout=0.5, return_when=asyncio.FIRST_COMPLETED
+            )
+            pending -= done
+            if not pending:
                 break
+            if progress in done:
+                progress = None
             
             if crawler.stats.total >= crawler.config.max_pages:
                 crawler._running = False
                 break
             
-            # Send progress
-            await manager.broadcast({
-                "type": "progress",
-                "crawl_id": crawl_id,
-                "stats": {
-                    "pages_crawled": crawler.stats.pages_crawled,
-                    "pages_failed": crawler.stats.pages_failed,
-                    "pages_skipped": crawler.stats.pages_skipped,
-                    "queue_size": crawler.frontier.size,
-                    "in_progress": crawler.frontier.in_progress_count,
-                    "urls_seen": crawler.frontier.seen_count
-                }
-            })
-            
-            await asyncio.sleep(0.5)
+            # Send progress, but only when something has changed; clearing
+            # first means a URL finishing during the send wakes the next pass
+            crawler.progress_event.clear()
+            if not manager.active_connections:
+                continue
+            snapshot = _progress_snapshot(crawler)
+            if snapshot != last_snapshot:
+                last_snapshot = snapshot
+                await manager.broadcast(
+                    progress_head + orjson.dumps(dict(zip(PROGRESS_FIELDS, snapshot))) + b'}'
+                )
         
         # Cancel remaining workers
+        if progress is not None:
+            progress.cancel()
         for w in workers:
             if not w.done():
                 w.cancel()
@@ -246,12 +394,9 @@ async def crawl_with_updates(crawler: Crawler, url: str, crawl_id: str):
         await asyncio.gather(*workers, return_exceptions=True)
         
         # Update session
-        await crawler.storage.db.update_session(
-            session_id,
-            status='completed',
-            pages_crawled=crawler.stats.pages_crawled,
-            pages_failed=crawler.stats.pages_failed
-        )
+        # Page counters are maintained by a trigger on the urls table, so they
+        # also cover the pages crawled before a resume
+        await crawler.storage.db.update_session(session_id, status='completed')
     finally:
         await crawler._cleanup()
 
@@ -283,51 +428,112 @@ async def stop_crawl(crawl_id: str):
     raise HTTPException(status_code=404, detail="Crawl not found")
 
 
+# Upper bound on sessions returned by /api/history
+HISTORY_MAX_LIMIT = 500
+
+
 @app.get("/api/history")
-async def get_crawl_history():
+async def get_crawl_history(limit: int = 20):
     """Get crawl history from database."""
-    db_path = Path("./data/crawler.db")
-    if not db_path.exists():
-        return {"sessions": []}
-    
-    db = CrawlDatabase(db_path)
-    db.connect()
-    
-    try:
-        cursor = db._conn.execute("""
-            SELECT id, seed_url, started_at, completed_at, status, pages_crawled, pages_failed
-            FROM crawl_sessions ORDER BY id DESC LIMIT 20
-        """)
-        sessions = [dict(row) for row in cursor.fetchall()]
-        return {"sessions": sessions}
-    finally:
-        db.close()
+    limit = max(1, min(limit, HISTORY_MAX_LIMIT))
+    sessions = await history_db.get_recent_sessions(limit)
+    return {"sessions": sessions}
 
 
-@app.get("/api/data/{session_id}")
-async def get_crawl_data(session_id: int, limit: int = 100):
-    """Get crawled data for a session."""
+# Seconds a content file, once seen, is trusted to exist without another stat
+CONTENT_EXISTS_TTL = 1.0
+# Session id -> monotonic time its content file was last seen
+_content_seen: dict[int, float] = {}
+
+
+def _content_file(session_id: int, detail: str = "Data not found") -> Path:
+    """Path of a session's content file; 404 with `detail` if it is missing."""
     content_file = Path(f"./data/content_{session_id}.jsonl")
-    if not content_file.exists():
-        raise HTTPException(status_code=404, detail="Data not found")
+    now = time.monotonic()
+    # Only hits are cached, so a file a new crawl creates shows up at once
+    if now - _content_seen.get(session_id, -CONTENT_EXISTS_TTL) >= CONTENT_EXISTS_TTL:
+        if not content_file.exists():
+            raise _content_missing(session_id, detail)
+        _content_seen[session_id] = now
+    return content_file
+
+
+def _content_missing(session_id: int, detail: str = "Data not found") -> HTTPException:
+    """Forget a session's content file and build the 404 for it."""
+    _content_seen.pop(session_id, None)
+    return HTTPException(status_code=404, detail=detail)
+
+
+@app.get("/api/data/{session_id}")
+async def get_crawl_data(session_id: int, limit: int = 100, start: int = 0):
+    """
+    Stream crawled data for a session as NDJSON, one record per line.
     
-    records = []
-    with open(content_file, 'r', encoding='utf-8') as f:
-        for i, line in enumerate(f):
-            if i >= limit:
-                break
-            if line.strip():
-                try:
-                    record = json.loads(line)
-                    # Remove large HTML field for API response
-                    if 'html' in record:
-                        record['html_length'] = len(record['html'])
-                        del record['html']
-                    records.append(record)
-                except json.JSONDecodeError:
-                    pass
+    `start` is a byte offset into the content file. The X-Next-Start
+    response header holds the offset of the following page, so clients
+    can page through a large session without rereading its head.
+    """
+    content_file = _content_file(session_id)
+    # The existence check may be cached, so a deleted file shows up here;
+    # once open, the handle stays readable for the whole response
+    try:
+        f = await asyncio.to_thread(open, content_file, 'rb')
+    except FileNotFoundError:
+        raise _content_missing(session_id)
+    start, end = await asyncio.to_thread(content_line_span, f, max(start, 0), limit)
     
-    return {"session_id": session_id, "records": records, "count": len(records)}
+    # A sync generator is iterated in the threadpool, off the event loop
+    return StreamingResponse(
+        _iter_data_lines(f, start, end),
+        media_type="application/x-ndjson",
+        headers={"X-Next-Start": str(end)}
+    )
+
+
+# Records are sent in chunks of about this many bytes; each chunk is one
+# threadpool round trip and one write to the client
+DATA_CHUNK_BYTES = 1 << 16
+
+
+def _iter_data_lines(f: BinaryIO, start: int, end: int) -> Iterator[bytes]:
+    """Yield the records between two byte offsets as NDJSON chunks, then close `f`."""
+    chunk: list[bytes] = []
+    chunk_size = 0
+    with f:
+        # A full orjson parse beats slicing the html field out of the raw
+        # bytes first: the extra scans cost more than the decode
+        for record in iter_content_records(f, start, end):
+            # Replace large HTML field with its length for API response
+            if 'html' in record:
+                record['html_length'] = len(record.pop('html'))
+            out = orjson.dumps(record) + b'\n'
+            chunk.append(out)
+            chunk_size += len(out)
+            if chunk_size >= DATA_CHUNK_BYTES:
+                yield b''.join(chunk)
+                chunk.clear()
+                chunk_size = 0
+    if chunk:
+        yield b''.join(chunk)
+
+
+@app.get("/api/data/{session_id}/raw")
+async def get_crawl_data_raw(session_id: int):
+    """Download a session's content file as-is (supports Range requests)."""
+    content_file = _content_file(session_id)
+    # Stat here so a file deleted since the cached check is a 404, not a
+    # failure inside FileResponse; it then skips its own stat
+    try:
+        stat_result = await asyncio.to_thread(os.stat, content_file)
+    except FileNotFoundError:
+        raise _content_missing(session_id)
+    
+    return FileResponse(
+        content_file,
+        media_type="application/x-ndjson",
+        filename=content_file.name,
+        stat_result=stat_result
+    )
 
 
 @app.websocket("/ws")
@@ -338,9 +544,12 @@ async def websocket_endpoint(websocket: WebSocket):
         while True:
             # Keep connection alive
             data = await websocket.receive_text()
-            # Echo back any messages
-            await websocket.send_json({"type": "pong", "data": data})
+            # Echo back any messages; the client's sender task writes it, so
+            # this loop never waits on a slow socket
+            manager.send(websocket, {"type": "pong", "data": data})
     except WebSocketDisconnect:
+        pass
+    finally:
         manager.disconnect(websocket)
 
 
@@ -362,30 +571,42 @@ class ScheduleRequest(BaseModel):
     render: bool = False
 
 
+# Encoded /api/schedules body and the scheduler generation it was built from
+_schedules_body: Optional[tuple[int, bytes]] = None
+
+
 @app.get("/api/schedules")
 async def get_schedules():
     """Get all schedules."""
+    global _schedules_body
     if not scheduler:
         raise HTTPException(status_code=503, detail="Scheduler not initialized")
     
-    schedules = scheduler.get_all_schedules()
-    return {
-        "schedules": [
-            {
-                "id": s.id,
-                "name": s.name,
-                "url": s.url,
-                "schedule_type": s.schedule_type.value,
-                "cron_expression": s.cron_expression,
-                "interval_seconds": s.interval_seconds,
-                "status": s.status.value,
-                "last_run": s.last_run.isoformat() if s.last_run else None,
-                "next_run": s.next_run.isoformat() if s.next_run else None,
-                "run_count": s.run_count
-            }
-            for s in schedules
-        ]
-    }
+    # The list only changes when a schedule is written, so reuse the
+    # encoded body until the scheduler reports a change
+    generation = scheduler.generation
+    if _schedules_body is None or _schedules_body[0] != generation:
+        schedules = scheduler.get_all_schedules()
+        body = orjson.dumps({
+            "schedules": [
+                {
+                    "id": s.id,
+                    "name": s.name,
+                    "url": s.url,
+                    "schedule_type": s.schedule_type.value,
+                    "cron_expression": s.cron_expression,
+                    "interval_seconds": s.interval_seconds,
+                    "status": s.status.value,
+                    "last_run": s.last_run,
+                    "next_run": s.next_run,
+                    "run_count": s.run_count
+                }
+                for s in schedules
+            ]
+        })
+        _schedules_body = (generation, body)
+    
+    return Response(content=_schedules_body[1], media_type="application/json")
 
 
 @app.post("/api/schedules")
@@ -444,7 +665,7 @@ async def get_schedule(schedule_id: int):
     if not schedule:
         raise HTTPException(status_code=404, detail="Schedule not found")
     
-    return {
+    return OrjsonResponse({
         "id": schedule.id,
         "name": schedule.name,
         "url": schedule.url,
@@ -458,10 +679,10 @@ async def get_schedule(schedule_id: int):
         "respect_robots": schedule.respect_robots,
         "render": schedule.render,
         "status": schedule.status.value,
-        "last_run": schedule.last_run.isoformat() if schedule.last_run else None,
-        "next_run": schedule.next_run.isoformat() if schedule.next_run else None,
+        "last_run": schedule.last_run,
+        "next_run": schedule.next_run,
         "run_count": schedule.run_count
-    }
+    })
 
 
 @app.delete("/api/schedules/{schedule_id}")
@@ -517,12 +738,27 @@ async def run_schedule_now(schedule_id: int):
     if not schedule:
         raise HTTPException(status_code=404, detail="Schedule not found")
     
-    # Trigger the crawl immediately
-    asyncio.create_task(scheduler._run_crawl(schedule_id))
+    # Hand the crawl to the run-now workers; refuse when they are backed up
+    try:
+        run_now_queue.put_nowait(schedule_id)
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=429, detail="Too many schedule runs pending")
     
     return {"message": "Schedule triggered"}
 
 
+async def _run_now_worker():
+    """Run queued "run now" crawls one at a time."""
+    while True:
+        schedule_id = await run_now_queue.get()
+        try:
+            await scheduler._run_crawl(schedule_id)
+        except Exception:
+            pass  # Keep the worker alive; the scheduler records run failures
+        finally:
+            run_now_queue.task_done()
+
+
 # ============== Change Detection API Endpoints ==============
 
 class MonitorUrlRequest(BaseModel):
@@ -601,7 +837,7 @@ async def get_url_changes(url_path: str):
     changes = change_db.get_changes_for_url(url)
     versions = change_db.get_version_history(url)
     
-    return {
+    return OrjsonResponse({
         "url": url,
         "changes": changes,
         "versions": [
@@ -609,11 +845,11 @@ async def get_url_changes(url_path: str):
                 "id": v.id,
                 "title": v.title,
                 "word_count": v.word_count,
-                "captured_at": v.captured_at.isoformat() if v.captured_at else None
+                "captured_at": v.captured_at
             }
             for v in versions
         ]
-    }
+    })
 
 
 @app.get("/api/changes/version/{version_id}")
@@ -626,14 +862,14 @@ async def get_version_content(version_id: int):
     if not version:
         raise HTTPException(status_code=404, detail="Version not found")
     
-    return {
+    return OrjsonResponse({
         "id": version.id,
         "url": version.url,
         "title": version.title,
         "text_content": version.text_content[:5000],  # Limit content size
         "word_count": version.word_count,
-        "captured_at": version.captured_at.isoformat() if version.captured_at else None
-    }
+        "captured_at": version.captured_at
+    })
 
 
 @app.get("/api/changes/diff/{old_id}/{new_id}")
@@ -648,9 +884,11 @@ async def get_version_diff(old_id: int, new_id: int):
     if not old_version or not new_version:
         raise HTTPException(status_code=404, detail="Version(s) not found")
     
-    detector = ChangeDetector(change_db)
-    diff_result = detector.calculate_diff(
-        old_version.text_content, 
+    # difflib is quadratic in the worst case; run it in a worker process
+    diff_result = await asyncio.get_running_loop().run_in_executor(
+        cpu_pool,
+        ChangeDetector.calculate_diff,
+        old_version.text_content,
         new_version.text_content
     )
     
@@ -671,8 +909,7 @@ async def check_url_for_changes(request: CheckUrlRequest):
     if not change_db:
         raise HTTPException(status_code=503, detail="Change detection not initialized")
     
-    detector = ChangeDetector(change_db)
-    change = detector.check_for_changes(request.url, request.html)
+    change = change_detector.check_for_changes(request.url, request.html)
     
     if change:
         return {
@@ -708,36 +945,15 @@ async def classify_text(request: ClassifyRequest):
 @app.get("/api/classify/session/{session_id}")
 async def classify_session(session_id: int, limit: int = 20):
     """Classify all content from a crawl session."""
-    content_file = Path(f"./data/content_{session_id}.jsonl")
-    if not content_file.exists():
-        raise HTTPException(status_code=404, detail="Session data not found")
+    content_file = _content_file(session_id, "Session data not found")
     
-    results = []
-    classifier = get_classifier(use_ml=False)  # Use fast rule-based
-    
-    with open(content_file, 'r', encoding='utf-8') as f:
-        for i, line in enumerate(f):
-            if i >= limit:
-                break
-            if line.strip():
-                try:
-                    record = json.loads(line)
-                    text = record.get('text', '')[:3000]
-                    title = record.get('title', '')
-                    url = record.get('url', '')
-                    
-                    classification = classifier.classify(text, url, title)
-                    results.append({
-                        "url": url,
-                        "title": title,
-                        "category": classification.category,
-                        "confidence": classification.category_confidence,
-                        "keywords": classification.keywords[:5],
-                        "sentiment": classification.sentiment,
-                        "word_count": classification.word_count
-                    })
-                except json.JSONDecodeError:
-                    pass
+    # Reading and classifying are CPU-bound; run them in a worker process
+    try:
+        results = await asyncio.get_running_loop().run_in_executor(
+            cpu_pool, classify_content_file, content_file, limit
+        )
+    except FileNotFoundError:
+        raise _content_missing(session_id, "Session data not found")
     
     # Category summary
     categories = {}
@@ -848,6 +1064,10 @@ async def index_all_sessions():
         except (ValueError, IndexError):
             pass
     
+    # Planner statistics once for the whole batch
+    if total:
+        search_index.analyze()
+    
     return {
         "message": f"Indexed {total} pages from {len(sessions)} sessions",
         "total_pages": total,